@@ -0,0 +1,75 @@
+# backend/ai_engine/checkpoints.py
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+import logging
+from typing import Any, Tuple
+
+from backend.config import CHECKPOINT_DIR, CHECKPOINT_TTL
+
+logger = logging.getLogger(__name__)
+
+def _to_json(value):
+    # numpy scalars from OpenCV/Whisper results
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def sweep_checkpoints(root: str = CHECKPOINT_DIR, ttl: int = CHECKPOINT_TTL):
+    """Remove checkpoints of jobs that stopped saving stages more than ttl seconds ago (failed for good)"""
+    cutoff = time.time() - ttl
+    try:
+        entries = list(os.scandir(root))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                logger.info(f"Swept stale checkpoints {entry.path}")
+        except OSError:
+            continue
+
+class CheckpointStore:
+    """Persists the output of each pipeline stage so a retried job can resume
+
+    Once a stage has fallen back to a degraded result the store is marked degraded and
+    stops saving, so nothing derived from the fallback is resumed later.
+    """
+
+    def __init__(self, checkpoint_id: str, root: str = CHECKPOINT_DIR):
+        digest = hashlib.sha256(checkpoint_id.encode()).hexdigest()[:32]
+        self.directory = os.path.join(root, digest)
+        self.degraded = False
+
+    def _stage_path(self, stage: str) -> str:
+        return os.path.join(self.directory, f"{stage}.json")
+
+    def load(self, stage: str) -> Tuple[bool, Any]:
+        """Return (found, value) for a completed stage"""
+        path = self._stage_path(stage)
+        if not os.path.exists(path):
+            return False, None
+        try:
+            with open(path) as f:
+                return True, json.load(f)["value"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return False, None
+
+    def save(self, stage: str, value: Any):
+        """Atomically record a stage's output"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._stage_path(stage)
+        # Unique per writer, so a redelivered job racing the original never shares a temp file
+        temp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"stage": stage, "value": value}, f, default=_to_json)
+        os.replace(temp_path, path)
+
+    def clear(self):
+        """Remove all checkpoints once the job has finished"""
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,333 @@
+# backend/ai_engine/edit_render.py
+import hashlib
+import json
+import math
+import os
+import shutil
+import subprocess
+import logging
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from typing import Dict, List, Optional, Tuple
+
+from moviepy.editor import VideoFileClip, TextClip, CompositeVideoClip
+
+from backend.config import (
+    RENDER_WORKERS, RENDER_SEGMENT_SECONDS, RENDER_SEGMENT_MIN_DURATION, RENDER_SEGMENT_CACHE_DIR,
+    RENDER_SEGMENT_CACHE_BYTES, PREVIEW_MAX_DIMENSION, PREVIEW_ENCODE_SETTINGS, ENCODE_PROFILES
+)
+from backend.utils.media_utils import get_ffmpeg_binary, hash_file
+from backend.utils.scratch import scratch_manager
+
+logger = logging.getLogger(__name__)
+
+# Rough upper bound used to reserve scratch space for encoded segments (8 Mbit/s)
+SEGMENT_BYTES_PER_SECOND = 1024 * 1024
+
+# Bump when segment encoding changes so cached segments are not reused
+SEGMENT_FORMAT_VERSION = 2
+
+def overlay_subtitles(video, subtitles: List[Dict]):
+    """Composite subtitle text over a clip; subtitle times are relative to the clip"""
+    clips = [video]
+    
+    for subtitle in subtitles:
+        if subtitle["start"] < 0 or subtitle["end"] > video.duration:
+            continue
+        
+        text_clip = TextClip(
+            subtitle["text"],
+            fontsize=40,
+            color='white',
+            stroke_color='black',
+            stroke_width=2,
+            font='Arial-Bold'
+        ).set_position(('center', 'bottom')).set_start(subtitle["start"]).set_duration(subtitle["end"] - subtitle["start"])
+        
+        clips.append(text_clip)
+    
+    return CompositeVideoClip(clips)
+
+def encode_profile(platform: str) -> Dict:
+    """Encode settings for a platform, falling back to the default vertical profile"""
+    return dict(ENCODE_PROFILES.get(platform, ENCODE_PROFILES["default"]))
+
+def capped_size(width: int, height: int, max_width: int, max_height: int) -> Tuple[int, int]:
+    """Largest size with the same aspect ratio that fits the caps, rounded to even dimensions for yuv420p"""
+    scale = min(1.0, max_width / width, max_height / height)
+    return max(2, int(width * scale) // 2 * 2), max(2, int(height * scale) // 2 * 2)
+
+def fit_within(clip, max_width: int, max_height: int):
+    """Scale a clip down (never up) to fit the caps"""
+    size = capped_size(clip.size[0], clip.size[1], max_width, max_height)
+    return clip if size == tuple(clip.size) else clip.resize(newsize=size)
+
+def fit_to_preview(clip):
+    """Scale a clip down so its longest side fits PREVIEW_MAX_DIMENSION"""
+    return fit_within(clip, PREVIEW_MAX_DIMENSION, PREVIEW_MAX_DIMENSION)
+
+def write_options(profile: Dict, fps: float) -> Dict:
+    """write_videofile options for an encode profile (x264 CRF, optional VBV cap and GOP, AAC, faststart)"""
+    ffmpeg_params = ["-crf", str(profile["crf"])]
+    if profile.get("maxrate"):
+        maxrate = profile["maxrate"]
+        bufsize = f"{int(maxrate[:-1]) * 2}{maxrate[-1]}" if maxrate[-1].isalpha() else str(int(maxrate) * 2)
+        ffmpeg_params += ["-maxrate", maxrate, "-bufsize", bufsize]
+    if profile.get("gop_seconds"):
+        gop = max(1, int(round(fps * profile["gop_seconds"])))
+        ffmpeg_params += ["-g", str(gop), "-keyint_min", str(gop), "-sc_threshold", "0"]
+    ffmpeg_params += ["-pix_fmt", "yuv420p"]
+    if profile.get("faststart"):
+        ffmpeg_params += ["-movflags", "+faststart"]
+    
+    return {
+        "fps": fps,
+        "codec": "libx264",
+        "preset": profile["preset"],
+        "audio_codec": "aac",
+        "audio_bitrate": profile["audio_bitrate"],
+        "ffmpeg_params": ffmpeg_params
+    }
+
+def preview_write_options(fps: float) -> Dict:
+    """write_videofile options for previews: fast preset, keyframe every gop_seconds, faststart"""
+    return write_options(PREVIEW_ENCODE_SETTINGS, fps)
+
+def build_edit_clip(spec: Dict) -> Tuple[VideoFileClip, object]:
+    """Build the moviepy clip described by an edit spec; returns (source, clip)"""
+    source = VideoFileClip(spec["source"])
+    clip = source.subclip(spec["start"], spec["end"])
+    
+    if spec.get("resize_height"):
+        clip = clip.resize(height=spec["resize_height"])
+    if spec.get("crop"):
+        x1, y1, x2, y2 = spec["crop"]
+        clip = clip.crop(x1=x1, y1=y1, x2=x2, y2=y2)
+    if spec.get("output_size"):
+        clip = clip.resize(newsize=tuple(spec["output_size"]))
+    if spec.get("subtitles"):
+        clip = overlay_subtitles(clip, spec["subtitles"])
+    
+    return source, clip
+
+def segment_bounds(start: float, end: float, fps: float,
+                   segment_seconds: float = RENDER_SEGMENT_SECONDS) -> List[Tuple[float, float]]:
+    """Split [start, end) near multiples of segment_seconds on the source timeline
+
+    Anchoring cuts to the source (not the output) keeps interior segments identical when the
+    edit's start or end moves by whole frames. Every cut is snapped to the output frame grid
+    (start + n/fps), so each segment holds a whole number of frames and the joined video stays
+    in sync with the audio, which is encoded in one piece.
+    """
+    def snap(t: float) -> float:
+        return start + round((t - start) * fps) / fps
+    
+    end = snap(end)
+    bounds = []
+    cursor = start
+    boundary = (math.floor(start / segment_seconds) + 1) * segment_seconds
+    while boundary < end - 1e-6:
+        cut = snap(boundary)
+        if cursor + 1e-6 < cut < end - 1e-6:
+            bounds.append((cursor, cut))
+            cursor = cut
+        boundary += segment_seconds
+    bounds.append((cursor, end))
+    return bounds
+
+def segment_frames(seg_start: float, seg_end: float, fps: float) -> int:
+    return max(1, round((seg_end - seg_start) * fps))
+
+def _encode_segment(spec: Dict, seg_start: float, seg_end: float, output_path: str, threads: int) -> str:
+    """Encode one video-only segment in a worker process; each segment starts on a keyframe"""
+    source, clip = build_edit_clip(spec)
+    try:
+        # moviepy writes a frame for every 1/fps step below the duration; ending half a frame short
+        # of the last one makes that exactly the segment's frame count, whatever the float rounding
+        frames = segment_frames(seg_start, seg_end, spec["fps"])
+        segment = clip.subclip(seg_start - spec["start"]).set_duration((frames - 0.5) / spec["fps"]).without_audio()
+        options = write_options(spec.get("encode") or encode_profile(spec.get("platform")), spec["fps"])
+        # faststart is applied once to the concatenated file
+        options["ffmpeg_params"] = [p for p in options["ffmpeg_params"] if p not in ("-movflags", "+faststart")]
+        segment.write_videofile(output_path, audio=False, threads=threads, verbose=False, logger=None, **options)
+        return output_path
+    finally:
+        clip.close()
+        source.close()
+
+def concat_segments(segment_paths: List[str], audio_path: str, output_path: str, list_path: str,
+                    faststart: bool = True, outpoints: Optional[List[float]] = None):
+    """Join encoded segments and mux the audio track without re-encoding
+
+    outpoints optionally trims each segment to that many seconds (segments must start on a keyframe).
+    """
+    with open(list_path, "w") as f:
+        for index, path in enumerate(segment_paths):
+            f.write(f"file '{os.path.abspath(path)}'\n")
+            if outpoints:
+                f.write(f"outpoint {outpoints[index]:.3f}\n")
+    
+    command = [get_ffmpeg_binary(), "-y", "-v", "error", "-f", "concat", "-safe", "0", "-i", list_path]
+    if audio_path:
+        command += ["-i", audio_path, "-map", "0:v", "-map", "1:a"]
+    command += ["-c", "copy"]
+    if faststart:
+        command += ["-movflags", "+faststart"]
+    command.append(output_path)
+    subprocess.run(command, check=True, capture_output=True)
+
+def render_single(spec: Dict, output_path: str, quality: str = "full") -> str:
+    """Render an edit in one moviepy/ffmpeg pass"""
+    source, clip = build_edit_clip(spec)
+    try:
+        if quality == "preview":
+            fit_to_preview(clip).write_videofile(output_path, verbose=False, logger=None,
+                                                 **preview_write_options(spec["fps"]))
+        else:
+            profile = spec.get("encode") or encode_profile(spec.get("platform"))
+            clip.write_videofile(output_path, verbose=False, logger=None, **write_options(profile, spec["fps"]))
+        return output_path
+    finally:
+        clip.close()
+        source.close()
+
+def segment_signature(spec: Dict, source_hash: str, seg_start: float, seg_end: float) -> str:
+    """Hash of everything that determines one encoded segment's pixels
+
+    Subtitles are expressed on the source clock so moving the cut does not invalidate
+    interior segments.
+    """
+    subtitles = [
+        {"start": round(s["start"] + spec["start"], 3), "end": round(s["end"] + spec["start"], 3), "text": s["text"]}
+        for s in spec.get("subtitles", [])
+        if s["start"] + spec["start"] < seg_end and s["end"] + spec["start"] > seg_start
+    ]
+    inputs = {
+        "version": SEGMENT_FORMAT_VERSION,
+        "source": source_hash,
+        "range": [round(seg_start, 3), round(seg_end, 3)],
+        "fps": spec["fps"],
+        "resize_height": spec.get("resize_height"),
+        "crop": list(spec["crop"]) if spec.get("crop") else None,
+        "output_size": list(spec["output_size"]) if spec.get("output_size") else None,
+        "encode": spec.get("encode") or encode_profile(spec.get("platform")),
+        "subtitles": subtitles
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+def prune_segment_cache(max_bytes: int = RENDER_SEGMENT_CACHE_BYTES):
+    """Delete least recently used segments until the cache fits its budget"""
+    if not os.path.isdir(RENDER_SEGMENT_CACHE_DIR):
+        return
+    entries = []
+    for entry in os.scandir(RENDER_SEGMENT_CACHE_DIR):
+        if entry.is_file() and not entry.name.startswith("."):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            continue
+
+def render_segmented(spec: Dict, output_path: str, workers: int = RENDER_WORKERS,
+                     manifest_path: Optional[str] = None) -> str:
+    """Render an edit from cached source-aligned segments, encoding only the ones whose inputs changed
+
+    Missing segments are encoded in parallel processes and the result is concatenated losslessly.
+    A manifest of the segments and their inputs is written next to the output unless
+    manifest_path says otherwise.
+    """
+    source_hash = hash_file(spec["source"])
+    profile = spec.get("encode") or encode_profile(spec.get("platform"))
+    os.makedirs(RENDER_SEGMENT_CACHE_DIR, exist_ok=True)
+    
+    segments = []
+    for seg_start, seg_end in segment_bounds(spec["start"], spec["end"], spec["fps"]):
+        signature = segment_signature(spec, source_hash, seg_start, seg_end)
+        segments.append({
+            "start": seg_start,
+            "end": seg_end,
+            "signature": signature,
+            "path": os.path.join(RENDER_SEGMENT_CACHE_DIR, f"{signature}.mp4")
+        })
+    
+    for segment in segments:
+        segment["reused"] = os.path.exists(segment["path"])
+        if segment["reused"]:
+            # Mark as recently used for pruning
+            os.utime(segment["path"])
+    missing = [segment for segment in segments if not segment["reused"]]
+    
+    workers = max(1, min(workers, len(missing) or 1))
+    threads = max(1, (os.cpu_count() or workers) // workers)
+    
+    with scratch_manager.job() as scratch:
+        # spawn keeps the workers free of the parent's threads and open readers
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = []
+            for index, segment in enumerate(missing):
+                expected_size = int((segment["end"] - segment["start"]) * SEGMENT_BYTES_PER_SECOND)
+                segment_path = scratch.path(f"segment_{index:04d}.mp4", expected_size=expected_size)
+                os.makedirs(os.path.dirname(segment_path), exist_ok=True)
+                futures.append(pool.submit(_encode_segment, spec, segment["start"], segment["end"],
+                                           segment_path, threads))
+            
+            # Audio is encoded once for the whole edit so there are no gaps at segment joins
+            audio_path = None
+            source, clip = build_edit_clip(spec)
+            try:
+                if clip.audio is not None:
+                    audio_path = scratch.path("audio.m4a", expected_size=int(clip.duration * 32 * 1024))
+                    os.makedirs(os.path.dirname(audio_path), exist_ok=True)
+                    clip.audio.write_audiofile(audio_path, fps=44100, codec="aac", bitrate=profile["audio_bitrate"],
+                                               verbose=False, logger=None)
+            finally:
+                clip.close()
+                source.close()
+            
+            for future, segment in zip(futures, missing):
+                # Publish atomically; a concurrent render of the same segment just overwrites it
+                partial_path = os.path.join(RENDER_SEGMENT_CACHE_DIR, f".{uuid.uuid4().hex}.partial.mp4")
+                shutil.move(future.result(), partial_path)
+                os.replace(partial_path, segment["path"])
+        
+        concat_segments([segment["path"] for segment in segments], audio_path, output_path,
+                        scratch.path("segments.txt"), faststart=profile.get("faststart", True))
+    
+    manifest_path = manifest_path or f"{os.path.splitext(output_path)[0]}.manifest.json"
+    with open(manifest_path, "w") as f:
+        json.dump({"spec": spec, "source_hash": source_hash, "segments": segments}, f)
+    
+    prune_segment_cache()
+    logger.info(f"Rendered {output_path}: encoded {len(missing)} of {len(segments)} segments on {workers} workers")
+    return output_path
+
+def render_edit(spec: Dict, output_path: str, mode: str = "auto", workers: int = RENDER_WORKERS,
+                manifest_path: Optional[str] = None, quality: str = "full") -> str:
+    """Render an edit spec, splitting long edits into cached, parallel segments
+
+    mode is "single", "segmented" or "auto" (segmented for edits of RENDER_SEGMENT_MIN_DURATION or more).
+    quality "preview" renders a small, fast single-pass encode instead.
+    """
+    if quality == "preview":
+        return render_single(spec, output_path, quality)
+    
+    if mode == "auto":
+        mode = "segmented" if spec["end"] - spec["start"] >= RENDER_SEGMENT_MIN_DURATION else "single"
+    
+    if mode == "segmented":
+        return render_segmented(spec, output_path, workers, manifest_path)
+    return render_single(spec, output_path)
+
+def planned_workers(spec: Dict, mode: str = "auto", workers: int = RENDER_WORKERS, quality: str = "full") -> int:
+    """How many encoder processes render_edit will use for this spec"""
+    if quality == "preview" or mode == "single" or (mode == "auto" and spec["end"] - spec["start"] < RENDER_SEGMENT_MIN_DURATION):
+        return 1
+    return max(1, min(workers, len(segment_bounds(spec["start"], spec["end"], spec["fps"]))))
@@ -0,0 +1,108 @@
+# backend/ai_engine/edl.py
+import hashlib
+import json
+import os
+import re
+import logging
+from typing import Dict, Optional
+
+from backend.config import EDL_DIR, EDL_RENDER_DIR
+from backend.utils.media_utils import hash_file
+
+logger = logging.getLogger(__name__)
+
+EDL_VERSION = 1
+
+_EDL_ID = re.compile(r"^[0-9a-f]{32}$")
+
+class EDLStore:
+    """Serializable edit decision lists, addressed by their content, and the renders cached for them
+
+    An EDL records what a platform edit is (source range, crop geometry, subtitle track and encode
+    profile) without encoding it; the MP4 is only produced when a preview or publish asks for it.
+    """
+
+    def __init__(self, root: str = EDL_DIR, render_dir: str = EDL_RENDER_DIR):
+        self.root = root
+        self.render_dir = render_dir
+
+    def build(self, spec: Dict) -> Dict:
+        """Turn an edit spec from SmartEditor.plan_platform_edit into an EDL"""
+        edl = dict(spec)
+        edl["version"] = EDL_VERSION
+        edl["source_hash"] = hash_file(spec["source"])
+        # Tuples do not survive a JSON round trip; store lists so saved and loaded EDLs hash the same
+        edl["source_size"] = list(spec["source_size"])
+        edl["crop"] = list(spec["crop"]) if spec.get("crop") else None
+        edl["output_size"] = list(spec["output_size"]) if spec.get("output_size") else None
+        return edl
+
+    @staticmethod
+    def edl_id(edl: Dict) -> str:
+        return hashlib.sha256(json.dumps(edl, sort_keys=True).encode()).hexdigest()[:32]
+
+    def _path(self, edl_id: str) -> str:
+        if not _EDL_ID.match(edl_id):
+            raise ValueError(f"Invalid EDL id: {edl_id}")
+        return os.path.join(self.root, f"{edl_id}.json")
+
+    def save(self, edl: Dict) -> str:
+        """Persist an EDL and return its id; saving the same decisions twice is a no-op"""
+        edl_id = self.edl_id(edl)
+        path = self._path(edl_id)
+        if not os.path.exists(path):
+            os.makedirs(self.root, exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(edl, f)
+            os.replace(temp_path, path)
+        return edl_id
+
+    def load(self, edl_id: str) -> Optional[Dict]:
+        path = self._path(edl_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable EDL {edl_id}: {e}")
+            return None
+
+    def _owner_path(self, edl_id: str, user_id: str) -> str:
+        owner = hashlib.sha256(user_id.encode()).hexdigest()[:32]
+        return os.path.join(os.path.dirname(self._path(edl_id)), "owners", edl_id, owner)
+
+    def grant(self, edl_id: str, user_id: str):
+        """Let a user open and render an EDL
+
+        EDLs are addressed by content, so users who upload the same video share them; each keeps a grant.
+        """
+        path = self._owner_path(edl_id, user_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "a").close()
+
+    def owned_by(self, edl_id: str, user_id: str) -> bool:
+        try:
+            return os.path.exists(self._owner_path(edl_id, user_id))
+        except ValueError:
+            return False
+
+    def exists(self, edl_id: str) -> bool:
+        try:
+            return os.path.exists(self._path(edl_id))
+        except ValueError:
+            return False
+
+    def render_path(self, edl_id: str, quality: str = "full") -> str:
+        """Where the full or preview render of an EDL is cached"""
+        self._path(edl_id)  # validates the id
+        suffix = ".preview" if quality == "preview" else ""
+        return os.path.join(self.render_dir, f"{edl_id}{suffix}.mp4")
+
+    def cached_render(self, edl_id: str, quality: str = "full") -> Optional[str]:
+        """Path of an existing render of this EDL, if any"""
+        path = self.render_path(edl_id, quality)
+        return path if os.path.exists(path) else None
+
+edl_store = EDLStore()
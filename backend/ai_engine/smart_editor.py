@@ -1,15 +1,25 @@
 # backend/ai_engine/smart_editor.py
 import cv2
 import numpy as np
-from moviepy.editor import VideoFileClip, concatenate_videoclips, TextClip, CompositeVideoClip
+from moviepy.editor import VideoFileClip
 import whisper
 import logging
-from typing import List, Dict, Tuple, Optional
+from typing import Any, Callable, List, Dict
 import os
+import uuid
 from datetime import datetime
 
-from backend.config import WHISPER_MODEL, SUPPORTED_ASPECT_RATIOS, MAX_VIDEO_DURATION
+from backend.config import WHISPER_MODEL, SUPPORTED_ASPECT_RATIOS, ENCODE_PROFILES, UPLOAD_DIR
 from backend.utils.crypto_utils import generate_secure_key
+from backend.utils.singleflight import coalesce_key
+from backend.utils.media_utils import probe_video
+from backend.utils.resource_governor import governor, JobRejected
+from backend.utils.metrics import StageMetrics
+from backend.utils.scratch import scratch_manager, ScratchQuotaExceeded
+from backend.ai_engine.timeline_assets import TimelineAssetGenerator
+from backend.ai_engine.checkpoints import CheckpointStore, sweep_checkpoints
+from backend.ai_engine.edit_render import render_edit, planned_workers, overlay_subtitles, encode_profile, capped_size
+from backend.ai_engine.edl import edl_store
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +27,7 @@ class SmartEditor:
     def __init__(self):
         self.whisper_model = None
         self.scene_threshold = 30.0  # Threshold for scene detection
+        self.timeline_generator = TimelineAssetGenerator()
         
     def load_whisper(self):
         """Load Whisper model for speech recognition"""
@@ -28,8 +39,8 @@ class SmartEditor:
                 logger.error(f"Failed to load Whisper model: {e}")
                 raise
     
-    def detect_scenes(self, video_path: str) -> List[Dict]:
-        """Detect scenes in video using OpenCV"""
+    def detect_scenes(self, video_path: str, raise_errors: bool = False) -> List[Dict]:
+        """Detect scenes in video using OpenCV; on failure returns no scenes unless raise_errors"""
         try:
             cap = cv2.VideoCapture(video_path)
             scenes = []
@@ -61,11 +72,13 @@ class SmartEditor:
             return scenes
             
         except Exception as e:
+            if raise_errors:
+                raise
             logger.error(f"Scene detection error: {e}")
             return []
     
-    def extract_audio_and_transcribe(self, video_path: str) -> Dict:
-        """Extract audio and transcribe using Whisper"""
+    def extract_audio_and_transcribe(self, video_path: str, raise_errors: bool = False) -> Dict:
+        """Extract audio and transcribe using Whisper; on failure returns an empty transcript unless raise_errors"""
         try:
             self.load_whisper()
             
@@ -73,16 +86,18 @@ class SmartEditor:
             video = VideoFileClip(video_path)
             audio = video.audio
             
-            # Save audio temporarily
-            temp_audio_path = f"temp_audio_{generate_secure_key(8)}.wav"
-            audio.write_audiofile(temp_audio_path, verbose=False, logger=None)
-            
-            # Transcribe
-            result = self.whisper_model.transcribe(temp_audio_path)
-            
-            # Clean up
-            os.remove(temp_audio_path)
-            video.close()
+            with scratch_manager.job() as scratch:
+                # Save audio temporarily as 16 kHz mono (what Whisper consumes), small enough for tmpfs
+                temp_audio_path = scratch.path("audio.wav", expected_size=int(video.duration * 16000 * 2) + 1024)
+                audio.write_audiofile(temp_audio_path, fps=16000, nbytes=2, ffmpeg_params=["-ac", "1"],
+                                      verbose=False, logger=None)
+                
+                # Transcribe
+                result = self.whisper_model.transcribe(temp_audio_path)
+                
+                # Clean up
+                os.remove(temp_audio_path)
+                video.close()
             
             return {
                 "text": result["text"],
@@ -90,12 +105,18 @@ class SmartEditor:
                 "language": result["language"]
             }
             
+        except (ScratchQuotaExceeded, JobRejected):
+            # Node backpressure, not a failed transcription: let the job be retried later
+            raise
         except Exception as e:
+            if raise_errors:
+                raise
             logger.error(f"Audio transcription error: {e}")
             return {"text": "", "segments": [], "language": "en"}
     
-    def find_highlight_moments(self, video_path: str, scenes: List[Dict], transcription: Dict) -> List[Dict]:
-        """Find the most engaging moments in the video"""
+    def find_highlight_moments(self, video_path: str, scenes: List[Dict], transcription: Dict,
+                               raise_errors: bool = False) -> List[Dict]:
+        """Find the most engaging moments in the video; on failure returns none unless raise_errors"""
         try:
             highlights = []
             
@@ -144,66 +165,129 @@ class SmartEditor:
             return highlights[:10]  # Return top 10 highlights
             
         except Exception as e:
+            if raise_errors:
+                raise
             logger.error(f"Highlight detection error: {e}")
             return []
     
-    def create_platform_edit(self, video_path: str, platform: str, highlights: List[Dict], 
-                           transcription: Dict, duration: int = 60) -> str:
-        """Create platform-specific video edit"""
+    def plan_platform_edit(self, video_path: str, platform: str, highlights: List[Dict],
+                           transcription: Dict, duration: int = 60) -> Dict:
+        """Decide the cut, crop and subtitles for a platform edit without rendering it"""
+        info = probe_video(video_path)
+        profile_name = platform if platform in ENCODE_PROFILES else "default"
+        profile = encode_profile(profile_name)
+        fps = min(info["fps"] or profile["fps"], profile["fps"])
+        
+        # Get platform aspect ratio
+        aspect_ratio = SUPPORTED_ASPECT_RATIOS.get(platform, (9, 16))
+        
+        # Select best highlight for the edit
+        if highlights:
+            best_highlight = highlights[0]
+            start_time = max(0, best_highlight["timestamp"] - duration/2)
+            end_time = min(info["duration"], start_time + duration)
+        else:
+            # Fallback to middle of video
+            start_time = max(0, (info["duration"] - duration) / 2)
+            end_time = min(info["duration"], start_time + duration)
+        
+        # Snap cuts to frame boundaries so segments join cleanly
+        start_time = round(start_time * fps) / fps
+        end_time = round(end_time * fps) / fps
+        
+        # Resize and crop for platform
+        resize_height, crop = None, None
+        w, h = info["width"], info["height"]
+        if aspect_ratio == (9, 16):
+            # Vertical format (TikTok, Shorts, Reels): center crop to 9:16
+            resize_height = 1920
+            w = int(w * resize_height / h)
+            crop_w = min(w, int(resize_height * 9 / 16))
+            x_center = w // 2
+            crop = (x_center - crop_w // 2, 0, x_center + crop_w // 2, resize_height)
+        elif aspect_ratio == (1, 1):
+            # Square format (Instagram posts)
+            resize_height = 1080
+            w = int(w * resize_height / h)
+            crop_size = min(w, resize_height)
+            x_center, y_center = w // 2, resize_height // 2
+            crop = (x_center - crop_size // 2, y_center - crop_size // 2,
+                    x_center + crop_size // 2, y_center + crop_size // 2)
+        
+        # Cap the output at the profile's resolution
+        if crop:
+            frame_size = (crop[2] - crop[0], crop[3] - crop[1])
+        elif resize_height:
+            frame_size = (w, resize_height)
+        else:
+            frame_size = (info["width"], info["height"])
+        output_size = capped_size(frame_size[0], frame_size[1], profile["max_width"], profile["max_height"])
+        
+        # Subtitle times relative to the cut
+        subtitles = [
+            {
+                "start": segment["start"] - start_time,
+                "end": segment["end"] - start_time,
+                "text": segment["text"]
+            }
+            for segment in transcription.get("segments", [])
+            if segment["start"] >= start_time and segment["end"] <= end_time
+        ]
+        
+        return {
+            "source": video_path,
+            "platform": platform,
+            "start": start_time,
+            "end": end_time,
+            "fps": fps,
+            "source_size": (info["width"], info["height"]),
+            "resize_height": resize_height,
+            "crop": crop,
+            "output_size": output_size if output_size != frame_size else None,
+            "encode_profile": profile_name,
+            "encode": profile,
+            "subtitles": subtitles
+        }
+    
+    def create_edit_decision_list(self, video_path: str, platform: str, highlights: List[Dict],
+                                  transcription: Dict, duration: int = 60) -> str:
+        """Plan a platform edit and store it as an EDL without rendering; returns the EDL id"""
+        spec = self.plan_platform_edit(video_path, platform, highlights, transcription, duration)
+        return edl_store.save(edl_store.build(spec))
+    
+    def render_edl(self, edl_id: str, render_mode: str = "auto", quality: str = "full") -> str:
+        """Render a stored EDL, reusing the cached output when it has been rendered before
+
+        quality "preview" produces a low-resolution, fast-start render for in-browser review.
+        """
+        cached = edl_store.cached_render(edl_id, quality)
+        if cached:
+            return cached
         try:
-            video = VideoFileClip(video_path)
-            
-            # Get platform aspect ratio
-            aspect_ratio = SUPPORTED_ASPECT_RATIOS.get(platform, (9, 16))
-            
-            # Select best highlight for the edit
-            if highlights:
-                best_highlight = highlights[0]
-                start_time = max(0, best_highlight["timestamp"] - duration/2)
-                end_time = min(video.duration, start_time + duration)
-            else:
-                # Fallback to middle of video
-                start_time = max(0, (video.duration - duration) / 2)
-                end_time = start_time + duration
-            
-            # Cut the video
-            edited_video = video.subclip(start_time, end_time)
+            edl = edl_store.load(edl_id)
+            if edl is None:
+                raise ValueError(f"Unknown EDL: {edl_id}")
             
-            # Resize for platform
-            if aspect_ratio == (9, 16):
-                # Vertical format (TikTok, Shorts, Reels)
-                edited_video = edited_video.resize(height=1920)
-                # Center crop to 9:16
-                w, h = edited_video.size
-                crop_w = int(h * 9 / 16)
-                x_center = w // 2
-                edited_video = edited_video.crop(x1=x_center-crop_w//2, y1=0, 
-                                               x2=x_center+crop_w//2, y2=h)
-            elif aspect_ratio == (1, 1):
-                # Square format (Instagram posts)
-                edited_video = edited_video.resize(height=1080)
-                w, h = edited_video.size
-                crop_size = min(w, h)
-                x_center = w // 2
-                y_center = h // 2
-                edited_video = edited_video.crop(x1=x_center-crop_size//2, y1=y_center-crop_size//2,
-                                               x2=x_center+crop_size//2, y2=y_center+crop_size//2)
-            
-            # Add subtitles if transcription exists
-            if transcription.get("segments"):
-                edited_video = self.add_subtitles(edited_video, transcription["segments"], start_time)
-            
-            # Generate output path
-            output_filename = f"edited_{platform}_{generate_secure_key(8)}.mp4"
-            output_path = os.path.join("uploads", "edited", output_filename)
+            output_path = edl_store.render_path(edl_id, quality)
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
-            # Write the edited video
-            edited_video.write_videofile(output_path, verbose=False, logger=None)
+            # Render beside the cache entry and publish atomically so readers never see a partial file
+            temp_path = os.path.join(os.path.dirname(output_path), f".{edl_id}.{uuid.uuid4().hex[:8]}.mp4")
             
-            # Clean up
-            video.close()
-            edited_video.close()
+            # Write the edited video, holding one CPU slot and one render's memory per encoder process,
+            # and running no more encoders than the node's memory budget fits
+            width, height = edl["source_size"]
+            memory_mb = governor.render_memory_mb(width, height)
+            workers = max(1, min(planned_workers(edl, render_mode, quality=quality),
+                                 int(governor.memory_budget_mb // memory_mb)))
+            try:
+                with governor.reserve(cpu=workers, memory_mb=memory_mb * workers):
+                    render_edit(edl, temp_path, mode=render_mode, workers=workers, quality=quality,
+                                manifest_path=f"{os.path.splitext(output_path)[0]}.manifest.json")
+                os.replace(temp_path, output_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
             
             return output_path
             
@@ -211,40 +295,28 @@ class SmartEditor:
             logger.error(f"Platform edit creation error: {e}")
             raise
     
+    def create_platform_edit(self, video_path: str, platform: str, highlights: List[Dict], 
+                           transcription: Dict, duration: int = 60, render_mode: str = "auto",
+                           quality: str = "full") -> str:
+        """Create platform-specific video edit and render it now ("full" or "preview" quality)"""
+        edl_id = self.create_edit_decision_list(video_path, platform, highlights, transcription, duration)
+        return self.render_edl(edl_id, render_mode, quality)
+    
     def add_subtitles(self, video: VideoFileClip, segments: List[Dict], start_time: float) -> VideoFileClip:
         """Add subtitles to video"""
         try:
-            clips = [video]
-            
-            for segment in segments:
-                segment_start = segment["start"] - start_time
-                segment_end = segment["end"] - start_time
-                
-                if segment_start < 0 or segment_end > video.duration:
-                    continue
-                
-                # Create text clip
-                text_clip = TextClip(
-                    segment["text"],
-                    fontsize=40,
-                    color='white',
-                    stroke_color='black',
-                    stroke_width=2,
-                    font='Arial-Bold'
-                ).set_position(('center', 'bottom')).set_duration(segment_end - segment_start)
-                
-                clips.append(text_clip)
-            
-            # Composite video with subtitles
-            final_video = CompositeVideoClip(clips)
-            return final_video
+            subtitles = [
+                {"start": s["start"] - start_time, "end": s["end"] - start_time, "text": s["text"]}
+                for s in segments
+            ]
+            return overlay_subtitles(video, subtitles)
             
         except Exception as e:
             logger.error(f"Subtitle addition error: {e}")
             return video
     
-    def generate_thumbnail(self, video_path: str, highlights: List[Dict]) -> str:
-        """Generate thumbnail from best highlight moment"""
+    def generate_thumbnail(self, video_path: str, highlights: List[Dict], raise_errors: bool = False) -> str:
+        """Generate thumbnail from best highlight moment; on failure returns "" unless raise_errors"""
         try:
             if not highlights:
                 # Use middle frame
@@ -263,7 +335,7 @@ class SmartEditor:
             if ret:
                 # Generate thumbnail filename
                 thumbnail_filename = f"thumbnail_{generate_secure_key(8)}.jpg"
-                thumbnail_path = os.path.join("uploads", "thumbnails", thumbnail_filename)
+                thumbnail_path = os.path.join(UPLOAD_DIR, "thumbnails", thumbnail_filename)
                 os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
                 
                 # Save thumbnail
@@ -273,44 +345,117 @@ class SmartEditor:
             return ""
             
         except Exception as e:
+            if raise_errors:
+                raise
             logger.error(f"Thumbnail generation error: {e}")
             return ""
     
     def process_video(self, video_path: str, platforms: List[str] = None) -> Dict:
         """Main method to process video and create edits for all platforms"""
+        if platforms is None:
+            platforms = ["tiktok", "youtube_shorts", "instagram_reels"]
+        
+        # Reject oversized jobs from container metadata before anything is decoded
+        cost = governor.admit(video_path)
+        
+        # Duplicate requests are coalesced by the job queue's dedupe key before they reach a worker
+        key = coalesce_key(video_path, "process_video", {"platforms": platforms})
+        sweep_checkpoints()
+        with scratch_manager.job():
+            return self._process_video(video_path, platforms, CheckpointStore(key), cost)
+    
+    def _run_stage(self, checkpoints: CheckpointStore, metrics: StageMetrics, stage: str, fn: Callable[[], Any],
+                   is_valid: Callable[[Any], bool] = None, resources: Dict = None,
+                   fallback: Callable[[], Any] = None) -> Any:
+        """Run a pipeline stage, reusing its checkpoint from an earlier attempt when present
+
+        With a fallback, a failing stage yields fallback() instead of failing the job. Fallbacks and
+        everything computed after one are not checkpointed, so retries and later requests for the
+        same video run those stages again.
+        """
+        found, value = checkpoints.load(stage)
+        if found and (is_valid is None or is_valid(value)):
+            logger.info(f"Resuming from checkpoint: {stage}")
+            metrics.skipped(stage, "checkpoint")
+            return value
+        
+        try:
+            with governor.reserve(**(resources or {})):
+                with metrics.stage(stage):
+                    value = fn()
+        except (JobRejected, ScratchQuotaExceeded):
+            raise
+        except Exception as e:
+            if fallback is None:
+                raise
+            logger.error(f"Stage {stage} failed, continuing with a fallback: {e}")
+            checkpoints.degraded = True
+            return fallback()
+        if not checkpoints.degraded:
+            checkpoints.save(stage, value)
+        return value
+    
+    def _process_video(self, video_path: str, platforms: List[str], checkpoints: CheckpointStore,
+                       cost: Dict) -> Dict:
+        metrics = StageMetrics()
         try:
-            if platforms is None:
-                platforms = ["tiktok", "youtube_shorts", "instagram_reels"]
-            
             # Detect scenes
-            scenes = self.detect_scenes(video_path)
+            scenes = self._run_stage(checkpoints, metrics, "scenes",
+                                     lambda: self.detect_scenes(video_path, raise_errors=True),
+                                     resources={"cpu": 1}, fallback=list)
             
             # Transcribe audio
-            transcription = self.extract_audio_and_transcribe(video_path)
+            transcription = self._run_stage(checkpoints, metrics, "transcription",
+                                            lambda: self.extract_audio_and_transcribe(video_path, raise_errors=True),
+                                            resources={"cpu": 1, "memory_mb": cost["transcribe_memory_mb"]},
+                                            fallback=lambda: {"text": "", "segments": [], "language": "en"})
             
             # Find highlights
-            highlights = self.find_highlight_moments(video_path, scenes, transcription)
+            highlights = self._run_stage(checkpoints, metrics, "highlights",
+                                         lambda: self.find_highlight_moments(video_path, scenes, transcription,
+                                                                             raise_errors=True),
+                                         fallback=list)
             
             # Generate thumbnail
-            thumbnail_path = self.generate_thumbnail(video_path, highlights)
+            thumbnail_path = self._run_stage(checkpoints, metrics, "thumbnail",
+                                             lambda: self.generate_thumbnail(video_path, highlights, raise_errors=True),
+                                             is_valid=lambda path: not path or os.path.exists(path), fallback=str)
+            
+            # Build timeline sprites and waveform for the editor
+            timeline = self._run_stage(checkpoints, metrics, "timeline",
+                                       lambda: self.timeline_generator.generate(video_path),
+                                       is_valid=self.timeline_generator.is_complete,
+                                       resources={"cpu": 1}, fallback=dict)
             
-            # Create platform-specific edits
+            # Plan platform-specific edits; each is rendered only when a preview or publish asks for it
             edits = {}
             for platform in platforms:
                 try:
-                    edit_path = self.create_platform_edit(video_path, platform, highlights, transcription)
-                    edits[platform] = edit_path
+                    edl_id = self._run_stage(
+                        checkpoints, metrics, f"edit_{platform}",
+                        lambda: self.create_edit_decision_list(video_path, platform, highlights, transcription),
+                        is_valid=edl_store.exists
+                    )
+                    edits[platform] = edl_id
+                except JobRejected:
+                    # Node is saturated; defer the whole job and resume from checkpoints later
+                    raise
                 except Exception as e:
                     logger.error(f"Failed to create edit for {platform}: {e}")
                     edits[platform] = None
             
+            checkpoints.clear()
+            
             return {
                 "original_video": video_path,
                 "scenes": scenes,
                 "transcription": transcription,
                 "highlights": highlights,
                 "thumbnail": thumbnail_path,
+                "timeline": timeline,
                 "edits": edits,
+                "cost_estimate": cost,
+                "metrics": metrics.summary(),
                 "processed_at": datetime.utcnow().isoformat()
             }
             
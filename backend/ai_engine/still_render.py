@@ -0,0 +1,89 @@
+# backend/ai_engine/still_render.py
+import re
+import subprocess
+import textwrap
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from backend.utils.media_utils import get_ffmpeg_binary
+
+logger = logging.getLogger(__name__)
+
+TITLE_FONT = "DejaVuSans-Bold.ttf"
+TITLE_FONT_SIZE = 60  # pixels on a 1920-pixel-high card, scaled with the card
+
+# ASS sizes are in units of a 288-line script, so captions scale with the frame: Fontsize 6 is
+# 40px (the moviepy subtitle size) on a 1920-pixel-high video
+CAPTION_STYLE = (
+    "FontName=Arial,Bold=1,Fontsize=6,PrimaryColour=&H00FFFFFF,OutlineColour=&H00000000,"
+    "BorderStyle=1,Outline=0.3,Shadow=0,Alignment=2,MarginV=10"
+)
+
+def _font(size: int):
+    try:
+        return ImageFont.truetype(TITLE_FONT, size)
+    except OSError:
+        return ImageFont.load_default(size)
+
+def render_title_card(title: str, size: Tuple[int, int], output_path: str):
+    """Draw the title, wrapped and centered in white on black, as a PNG of the given size"""
+    width, height = size
+    image = Image.new("RGB", size, "black")
+    draw = ImageDraw.Draw(image)
+    font = _font(max(8, round(TITLE_FONT_SIZE * height / 1920)))
+
+    # Wrap to 90% of the card width
+    columns = max(1, len(title))
+    lines = textwrap.wrap(title, columns) or [""]
+    while columns > 1 and max(draw.textlength(line, font=font) for line in lines) > width * 0.9:
+        columns -= 1
+        lines = textwrap.wrap(title, columns)
+    draw.multiline_text((width / 2, height / 2), "\n".join(lines), font=font, fill="white",
+                        anchor="mm", align="center")
+    image.save(output_path)
+
+def _srt_time(seconds: float) -> str:
+    milliseconds = int(round(max(0.0, seconds) * 1000))
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
+
+def write_srt(segments: List[Dict], output_path: str, duration: float) -> int:
+    """Write subtitle segments (times in seconds) as SRT, dropping ones outside the video; returns the count"""
+    count = 0
+    with open(output_path, "w", encoding="utf-8") as f:
+        for segment in segments:
+            start, end = segment["start"], min(segment["end"], duration)
+            text = segment["text"].strip()
+            if start >= end or not text:
+                continue
+            count += 1
+            f.write(f"{count}\n{_srt_time(start)} --> {_srt_time(end)}\n{text}\n\n")
+    return count
+
+def _filter_path(path: str) -> str:
+    """Escape a path for use as a filter option value inside a filtergraph"""
+    option_value = re.sub(r"([\\':])", r"\\\1", path)
+    return re.sub(r"([\\',;\[\]])", r"\\\1", option_value)
+
+def encode_still(image_path: str, audio_path: str, output_path: str, duration: float, options: Dict,
+                 subtitles_path: Optional[str] = None):
+    """Loop a still image for duration seconds with the audio in one x264 encode, burning in subtitles
+
+    options are write_videofile options (see edit_render.write_options), translated to ffmpeg flags.
+    """
+    command = [
+        get_ffmpeg_binary(), "-y", "-v", "error",
+        "-loop", "1", "-framerate", str(options["fps"]), "-i", image_path, "-i", audio_path,
+        "-map", "0:v", "-map", "1:a", "-t", f"{duration:.3f}"
+    ]
+    if subtitles_path:
+        command += ["-vf", f"subtitles=filename={_filter_path(subtitles_path)}:force_style='{CAPTION_STYLE}'"]
+    command += [
+        "-c:v", options["codec"], "-preset", options["preset"], "-tune", "stillimage", *options["ffmpeg_params"],
+        "-c:a", options["audio_codec"], "-b:a", options["audio_bitrate"], output_path
+    ]
+    subprocess.run(command, check=True, capture_output=True)
@@ -0,0 +1,141 @@
+# backend/ai_engine/stock_footage.py
+import asyncio
+import subprocess
+import logging
+from typing import Dict, List, Optional
+
+from backend.config import (
+    STOCK_CACHE_DIR, STOCK_CACHE_BYTES, STOCK_DOWNLOAD_CONCURRENCY, STOCK_MAX_DOWNLOAD_BYTES,
+    STOCK_DOWNLOAD_CHUNK_SIZE, STOCK_NORMALIZED_DIR, STOCK_NORMALIZED_BYTES, STOCK_NORMALIZED_GOP_SECONDS
+)
+from backend.utils.disk_cache import DiskLRUCache
+from backend.utils.http_clients import http_clients
+from backend.utils.media_utils import probe_video, get_ffmpeg_binary
+from backend.utils.resource_governor import governor, JobRejected
+from backend.ai_engine.edit_render import encode_profile
+
+logger = logging.getLogger(__name__)
+
+def canonical_format() -> Dict:
+    """Size, fps and encode settings every normalized clip shares (from the "default" profile)"""
+    profile = encode_profile("default")
+    return {
+        "width": profile["max_width"],
+        "height": profile["max_height"],
+        "fps": profile["fps"],
+        "gop": max(1, int(round(profile["fps"] * STOCK_NORMALIZED_GOP_SECONDS))),
+        "crf": profile["crf"],
+        "maxrate": profile["maxrate"]
+    }
+
+def select_video_file(video_files: List[Dict], width: int, height: int) -> Optional[Dict]:
+    """Smallest rendition that covers width x height without upscaling, else the largest one"""
+    files = [f for f in video_files if f.get("width") and f.get("height") and f.get("link")]
+    if not files:
+        return None
+    files.sort(key=lambda f: f["width"] * f["height"])
+    for video_file in files:
+        if video_file["width"] >= width and video_file["height"] >= height:
+            return video_file
+    return files[-1]
+
+def normalize_clip(source_path: str, output_path: str, fmt: Dict):
+    """Scale-to-fill, center-crop and re-time a clip to the canonical format (video only)"""
+    width, height = fmt["width"], fmt["height"]
+    subprocess.run([
+        get_ffmpeg_binary(), "-y", "-v", "error", "-i", source_path, "-an",
+        "-vf", f"scale={width}:{height}:force_original_aspect_ratio=increase,crop={width}:{height},"
+               f"fps={fmt['fps']},setsar=1",
+        "-c:v", "libx264", "-preset", "veryfast", "-crf", str(fmt["crf"]),
+        "-maxrate", fmt["maxrate"], "-bufsize", fmt["maxrate"],
+        "-g", str(fmt["gop"]), "-keyint_min", str(fmt["gop"]), "-sc_threshold", "0",
+        "-pix_fmt", "yuv420p", "-movflags", "+faststart", "-f", "mp4", output_path
+    ], check=True, capture_output=True)
+
+class StockFootageDownloader:
+    """Downloads stock clips concurrently, streaming them into a URL-keyed on-disk LRU cache"""
+
+    def __init__(self, cache: DiskLRUCache = None, concurrency: int = STOCK_DOWNLOAD_CONCURRENCY,
+                 normalized_cache: DiskLRUCache = None):
+        self.cache = cache or DiskLRUCache(STOCK_CACHE_DIR, STOCK_CACHE_BYTES, suffix=".mp4")
+        self.normalized_cache = normalized_cache or DiskLRUCache(STOCK_NORMALIZED_DIR, STOCK_NORMALIZED_BYTES,
+                                                                 suffix=".mp4")
+        self.concurrency = concurrency
+
+    async def fetch(self, url: str) -> str:
+        """Local path of the clip at url, downloading it on a cache miss"""
+        cached = self.cache.get(url)
+        if cached:
+            logger.info(f"Stock footage cache hit: {url}")
+            return cached
+
+        with self.cache.writer(url) as temp_path:
+            await self._stream_to(url, temp_path)
+            info = await asyncio.to_thread(probe_video, temp_path)
+            if not info["width"] or not info["frame_count"]:
+                raise ValueError(f"Downloaded file is not a playable video: {url}")
+        return self.cache.path_for(url)
+
+    async def fetch_normalized(self, url: str) -> str:
+        """Local path of the clip at url transcoded to the canonical format, transcoding on a cache miss"""
+        fmt = canonical_format()
+        key = f"{url}|{fmt}"
+        cached = self.normalized_cache.get(key)
+        if cached:
+            return cached
+
+        source_path = await self.fetch(url)
+
+        def transcode(temp_path: str):
+            with governor.reserve(cpu=1):
+                normalize_clip(source_path, temp_path, fmt)
+
+        with self.normalized_cache.writer(key) as temp_path:
+            await asyncio.to_thread(transcode, temp_path)
+        return self.normalized_cache.path_for(key)
+
+    async def _stream_to(self, url: str, path: str):
+        async with http_clients.get("downloads").stream("GET", url) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "")
+            if content_type and not content_type.startswith(("video/", "application/octet-stream")):
+                raise ValueError(f"Unexpected content type {content_type} for {url}")
+            if int(response.headers.get("content-length") or 0) > STOCK_MAX_DOWNLOAD_BYTES:
+                raise ValueError(f"Stock clip too large: {url}")
+
+            size = 0
+            with open(path, "wb") as f:
+                async for chunk in response.aiter_bytes(STOCK_DOWNLOAD_CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > STOCK_MAX_DOWNLOAD_BYTES:
+                        raise ValueError(f"Stock clip too large: {url}")
+                    f.write(chunk)
+
+    async def fetch_all(self, urls: List[str], normalize: bool = False) -> List[str]:
+        """Fetch clips with bounded concurrency; returns local paths in url order, skipping failures
+
+        With normalize, the paths are canonical-format versions that can be joined by stream copy.
+        JobRejected (no transcode capacity on this node) is not a clip failure: it cancels the other
+        fetches and propagates so the job is retried later instead of rendering without the footage.
+        """
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def fetch_one(index: int, url: str) -> Optional[str]:
+            async with slots:
+                try:
+                    return await (self.fetch_normalized(url) if normalize else self.fetch(url))
+                except JobRejected:
+                    raise
+                except Exception as e:
+                    logger.error(f"Failed to download stock footage {index}: {e}")
+                    return None
+
+        tasks = [asyncio.create_task(fetch_one(i, url)) for i, url in enumerate(urls)]
+        try:
+            paths = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return [path for path in paths if path]
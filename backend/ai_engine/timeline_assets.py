@@ -0,0 +1,208 @@
+# backend/ai_engine/timeline_assets.py
+import cv2
+import numpy as np
+import json
+import os
+import subprocess
+import uuid
+import logging
+from typing import Dict, List
+
+from backend.config import (
+    TIMELINE_DIR, TIMELINE_SPRITE_INTERVAL, TIMELINE_TILE_WIDTH, TIMELINE_SHEET_COLUMNS,
+    TIMELINE_SHEET_ROWS, WAVEFORM_SAMPLE_RATE, WAVEFORM_PEAKS_PER_SECOND
+)
+from backend.utils.media_utils import hash_file, get_ffmpeg_binary
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes so stale caches are rebuilt
+TIMELINE_ASSETS_VERSION = 1
+
+class TimelineAssetGenerator:
+    """Builds sprite-sheet tiles and waveform peaks for the editor timeline"""
+
+    def __init__(self, output_dir: str = TIMELINE_DIR):
+        self.output_dir = output_dir
+        self.interval = TIMELINE_SPRITE_INTERVAL
+        self.tile_width = TIMELINE_TILE_WIDTH
+        self.columns = TIMELINE_SHEET_COLUMNS
+        self.rows = TIMELINE_SHEET_ROWS
+        self.sample_rate = WAVEFORM_SAMPLE_RATE
+        self.samples_per_peak = max(1, WAVEFORM_SAMPLE_RATE // WAVEFORM_PEAKS_PER_SECOND)
+
+    def _params(self) -> Dict:
+        return {
+            "version": TIMELINE_ASSETS_VERSION,
+            "interval": self.interval,
+            "tile_width": self.tile_width,
+            "columns": self.columns,
+            "rows": self.rows,
+            "sample_rate": self.sample_rate,
+            "samples_per_peak": self.samples_per_peak
+        }
+
+    def generate(self, video_path: str) -> Dict:
+        """Return the timeline manifest for a video, building it on first request"""
+        video_hash = hash_file(video_path)
+        asset_dir = os.path.join(self.output_dir, video_hash[:32])
+        manifest_path = os.path.join(asset_dir, "manifest.json")
+
+        cached = self._load_manifest(manifest_path)
+        if cached:
+            return cached
+
+        os.makedirs(asset_dir, exist_ok=True)
+        sprites = self._build_sprites(video_path, asset_dir)
+        waveform = self._build_waveform(video_path, asset_dir)
+
+        manifest = {
+            "video_hash": video_hash,
+            "params": self._params(),
+            "sprites": sprites,
+            "waveform": waveform
+        }
+
+        # Write the manifest last so a partial build is never served from cache
+        temp_path = f"{manifest_path}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(temp_path, manifest_path)
+
+        logger.info(f"Built timeline assets for {video_path}: {sprites['tile_count']} tiles")
+        return manifest
+
+    def _load_manifest(self, manifest_path: str) -> Dict:
+        if not os.path.exists(manifest_path):
+            return {}
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return manifest if self.is_complete(manifest) else {}
+
+    def is_complete(self, manifest: Dict) -> bool:
+        """Whether a manifest was built with the current settings and all its files still exist"""
+        try:
+            if manifest.get("params") != self._params():
+                return False
+            files = [sheet["path"] for sheet in manifest["sprites"]["sheets"]] + [manifest["waveform"]["path"]]
+        except (AttributeError, KeyError, TypeError):
+            return False
+        return all(os.path.exists(path) for path in files)
+
+    def _build_sprites(self, video_path: str, asset_dir: str) -> Dict:
+        """Decode the video once, front to back, keeping one tile per interval"""
+        cap = cv2.VideoCapture(video_path)
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        step = max(1, int(round(fps * self.interval)))
+        per_sheet = self.columns * self.rows
+
+        tiles: List[np.ndarray] = []
+        sheets = []
+        tile_height = 0
+        tile_count = 0
+        frame_index = 0
+
+        try:
+            # grab() advances without converting the frame, retrieve() only for kept frames
+            while cap.grab():
+                if frame_index % step == 0:
+                    ret, frame = cap.retrieve()
+                    if ret:
+                        if not tile_height:
+                            h, w = frame.shape[:2]
+                            tile_height = max(1, int(round(h * self.tile_width / w)))
+                        tiles.append(cv2.resize(frame, (self.tile_width, tile_height), interpolation=cv2.INTER_AREA))
+                        tile_count += 1
+                        if len(tiles) == per_sheet:
+                            sheets.append(self._write_sheet(tiles, asset_dir, len(sheets), tile_height))
+                            tiles = []
+                frame_index += 1
+        finally:
+            cap.release()
+
+        if tiles:
+            sheets.append(self._write_sheet(tiles, asset_dir, len(sheets), tile_height))
+
+        return {
+            "interval": step / fps,
+            "tile_width": self.tile_width,
+            "tile_height": tile_height,
+            "columns": self.columns,
+            "rows": self.rows,
+            "tile_count": tile_count,
+            "sheets": sheets
+        }
+
+    def _write_sheet(self, tiles: List[np.ndarray], asset_dir: str, index: int, tile_height: int) -> Dict:
+        rows_used = (len(tiles) + self.columns - 1) // self.columns
+        sheet = np.zeros((rows_used * tile_height, self.columns * self.tile_width, 3), dtype=np.uint8)
+        for i, tile in enumerate(tiles):
+            row, col = divmod(i, self.columns)
+            y, x = row * tile_height, col * self.tile_width
+            sheet[y:y + tile_height, x:x + self.tile_width] = tile
+
+        sheet_path = os.path.join(asset_dir, f"sprites_{index:03d}.jpg")
+        cv2.imwrite(sheet_path, sheet, [cv2.IMWRITE_JPEG_QUALITY, 80])
+        return {"path": sheet_path, "first_tile": index * self.columns * self.rows, "tile_count": len(tiles)}
+
+    def _build_waveform(self, video_path: str, asset_dir: str) -> Dict:
+        """Stream mono PCM from ffmpeg and reduce it to min/max pairs (peaks.js v2 format)"""
+        command = [
+            get_ffmpeg_binary(), "-v", "error", "-i", video_path,
+            "-vn", "-ac", "1", "-ar", str(self.sample_rate),
+            "-f", "s16le", "-acodec", "pcm_s16le", "-"
+        ]
+        bytes_per_peak = self.samples_per_peak * 2
+        data: List[int] = []
+        pending = b""
+
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        try:
+            while True:
+                chunk = process.stdout.read(bytes_per_peak * 256)
+                if not chunk:
+                    break
+                pending += chunk
+                usable = len(pending) - len(pending) % bytes_per_peak
+                if usable:
+                    samples = np.frombuffer(pending[:usable], dtype="<i2").reshape(-1, self.samples_per_peak)
+                    data.extend(self._reduce_peaks(samples))
+                    pending = pending[usable:]
+
+            remainder = len(pending) // 2 * 2
+            if remainder:
+                samples = np.frombuffer(pending[:remainder], dtype="<i2").reshape(1, -1)
+                data.extend(self._reduce_peaks(samples))
+        finally:
+            process.stdout.close()
+            process.wait()
+
+        if process.returncode != 0:
+            # Videos without an audio stream get an empty waveform
+            logger.warning(f"Waveform extraction failed for {video_path} (ffmpeg exit {process.returncode})")
+            data = []
+
+        waveform = {
+            "version": 2,
+            "channels": 1,
+            "sample_rate": self.sample_rate,
+            "samples_per_pixel": self.samples_per_peak,
+            "bits": 8,
+            "length": len(data) // 2,
+            "data": data
+        }
+        waveform_path = os.path.join(asset_dir, "waveform.json")
+        with open(waveform_path, "w") as f:
+            json.dump(waveform, f, separators=(",", ":"))
+
+        return {"path": waveform_path, "length": waveform["length"], "samples_per_pixel": self.samples_per_peak}
+
+    @staticmethod
+    def _reduce_peaks(samples: np.ndarray) -> List[int]:
+        # Scale 16-bit samples down to the 8-bit range the editor draws with
+        mins = (samples.min(axis=1) >> 8).astype(np.int8)
+        maxs = (samples.max(axis=1) >> 8).astype(np.int8)
+        return np.column_stack((mins, maxs)).ravel().tolist()
@@ -1,22 +1,149 @@
 # backend/ai_engine/video_generator.py
-import openai
+from openai import AsyncOpenAI
 import httpx
 import json
 import os
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import asyncio
 
-from backend.config import OPENAI_API_KEY, ELEVENLABS_API_KEY, GPT_MODEL, MAX_TOKENS, TEMPERATURE
+from backend.config import (
+    OPENAI_API_KEY, ELEVENLABS_API_KEY, GPT_MODEL, MAX_TOKENS, TEMPERATURE,
+    OPENAI_TIMEOUT, OPENAI_MAX_RETRIES, OPENAI_MAX_CONCURRENCY, STOCK_SEARCH_TTL, STOCK_SEARCH_NEGATIVE_TTL,
+    STOCK_SEARCH_CACHE_SIZE, VOICEOVER_CACHE_DIR, VOICEOVER_CACHE_BYTES, VOICEOVER_CHUNKED,
+    VOICEOVER_CHUNK_CONCURRENCY, VOICEOVER_CHUNK_GAP_SECONDS, VOICEOVER_SAMPLE_RATE, GENERATOR_RENDER_TIMEOUT,
+    PREVIEW_MAX_DIMENSION, UPLOAD_DIR
+)
 from backend.utils.crypto_utils import generate_secure_key
+from backend.utils.resource_governor import governor
+from backend.utils.metrics import StageMetrics
+from backend.utils.http_clients import http_clients
+from backend.utils.ttl_cache import TTLCache
+from backend.utils.disk_cache import DiskLRUCache
+from backend.utils.process_pool import media_pool
+from backend.ai_engine.voiceover_chunks import (
+    voiceover_chunks, decode_pcm, chunk_timings, stitch_pcm, audio_duration
+)
+from backend.ai_engine.stock_footage import StockFootageDownloader, canonical_format, select_video_file
+from backend.utils.scratch import scratch_manager
+from backend.utils.media_utils import probe_video
+from backend.ai_engine.edit_render import (
+    fit_to_preview, preview_write_options, fit_within, write_options, encode_profile, concat_segments,
+    overlay_subtitles, capped_size
+)
+from backend.ai_engine.still_render import render_title_card, write_srt, encode_still
 
 logger = logging.getLogger(__name__)
 
+# OpenAI client and concurrency limit per event loop (workers run a loop per job)
+_openai_state = {"loop": None, "client": None, "slots": None}
+
+def _openai_client():
+    """Return (client, semaphore) bound to the running event loop, on the shared "openai" pool"""
+    loop = asyncio.get_running_loop()
+    if _openai_state["loop"] is not loop:
+        _openai_state.update(
+            loop=loop,
+            client=AsyncOpenAI(api_key=OPENAI_API_KEY, timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=10.0),
+                               max_retries=OPENAI_MAX_RETRIES, http_client=http_clients.get("openai")),
+            slots=asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+        )
+    return _openai_state["client"], _openai_state["slots"]
+
+def add_generated_subtitles(video, segments: List[Dict]):
+    """Add subtitles to generated video"""
+    try:
+        # Segments timed from the voiceover can end a rounding error past the clip
+        subtitles = [
+            {**segment, "end": min(segment["end"], video.duration)}
+            for segment in segments if segment["start"] < video.duration
+        ]
+        return overlay_subtitles(video, subtitles)
+        
+    except Exception as e:
+        logger.error(f"Subtitle addition error: {e}")
+        return video
+
+def render_generated_video(script_data: Dict, voiceover_path: str, background_path: str,
+                           quality: str, profile: Dict, output_path: str) -> str:
+    """Compose and encode a generated video over its footage with moviepy
+
+    CPU-bound and blocking: VideoGenerator runs it in a media_pool process, so it must stay a
+    top-level function with picklable arguments.
+    """
+    from moviepy.editor import AudioFileClip, VideoFileClip, vfx
+    
+    # Load voiceover
+    audio = AudioFileClip(voiceover_path)
+    duration = audio.duration
+    
+    # Clips already share size, fps and codec settings, so joining them needed no re-encode
+    video = VideoFileClip(background_path, audio=False)
+    if video.duration < duration:
+        video = video.fx(vfx.loop, duration=duration)
+    else:
+        video = video.set_duration(duration)
+    
+    # Add subtitles
+    if script_data.get("segments"):
+        video = add_generated_subtitles(video, script_data["segments"])
+    
+    # Combine video and audio
+    final_video = video.set_audio(audio)
+    
+    # Write final video once the node has encoder capacity
+    with governor.reserve(cpu=1, memory_mb=governor.render_memory_mb(*final_video.size)):
+        if quality == "preview":
+            fit_to_preview(final_video).write_videofile(output_path, verbose=False, logger=None,
+                                                        **preview_write_options(final_video.fps or 24))
+        else:
+            fps = min(final_video.fps or profile["fps"], profile["fps"])
+            fit_within(final_video, profile["max_width"], profile["max_height"]).write_videofile(
+                output_path, verbose=False, logger=None, **write_options(profile, fps)
+            )
+    
+    # Clean up
+    audio.close()
+    video.close()
+    final_video.close()
+    
+    return output_path
+
+def render_title_card_video(script_data: Dict, voiceover_path: str, duration: float, quality: str,
+                            profile: Dict, output_path: str, scratch) -> str:
+    """Render a generated video without footage: the title card as a still, looped in one ffmpeg encode
+
+    Captions are burned in by the encoder, so nothing is composited frame by frame.
+    """
+    if quality == "preview":
+        size = capped_size(1080, 1920, PREVIEW_MAX_DIMENSION, PREVIEW_MAX_DIMENSION)
+        options = preview_write_options(24)
+    else:
+        size = capped_size(1080, 1920, profile["max_width"], profile["max_height"])
+        options = write_options(profile, profile["fps"])
+    
+    card_path = scratch.path("title_card.png")
+    os.makedirs(os.path.dirname(card_path), exist_ok=True)
+    render_title_card(script_data.get("title", ""), size, card_path)
+    
+    subtitles_path = None
+    if script_data.get("segments"):
+        subtitles_path = scratch.path("captions.srt")
+        os.makedirs(os.path.dirname(subtitles_path), exist_ok=True)
+        if not write_srt(script_data["segments"], subtitles_path, duration):
+            subtitles_path = None
+    
+    with governor.reserve(cpu=1):
+        encode_still(card_path, voiceover_path, output_path, duration, options, subtitles_path)
+    return output_path
+
 class VideoGenerator:
     def __init__(self):
-        openai.api_key = OPENAI_API_KEY
         self.elevenlabs_api_key = ELEVENLABS_API_KEY
+        self.footage_downloader = StockFootageDownloader()
+        self.stock_search_cache = TTLCache("pexels_search", STOCK_SEARCH_CACHE_SIZE)
+        self.voiceover_cache = DiskLRUCache(VOICEOVER_CACHE_DIR, VOICEOVER_CACHE_BYTES, suffix=".mp3")
         
     async def generate_script(self, topic: str, duration: int = 60, style: str = "engaging") -> Dict:
         """Generate video script using GPT"""
@@ -48,15 +175,17 @@ class VideoGenerator:
             }}
             """
             
-            response = openai.ChatCompletion.create(
-                model=GPT_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a professional video script writer specializing in short-form social media content."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=MAX_TOKENS,
-                temperature=TEMPERATURE
-            )
+            client, slots = _openai_client()
+            async with slots:
+                response = await client.chat.completions.create(
+                    model=GPT_MODEL,
+                    messages=[
+                        {"role": "system", "content": "You are a professional video script writer specializing in short-form social media content."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=MAX_TOKENS,
+                    temperature=TEMPERATURE
+                )
             
             script_data = json.loads(response.choices[0].message.content)
             logger.info(f"Generated script for topic: {topic}")
@@ -66,8 +195,13 @@ class VideoGenerator:
             logger.error(f"Script generation error: {e}")
             raise
     
-    async def generate_voiceover(self, script: str, voice_id: str = "21m00Tcm4TlvDq8ikWAM") -> str:
-        """Generate voiceover using ElevenLabs"""
+    async def generate_voiceover(self, script: str, voice_id: str = "21m00Tcm4TlvDq8ikWAM",
+                                 previous_text: str = None, next_text: str = None) -> str:
+        """Generate voiceover using ElevenLabs, reusing the audio of an identical earlier request
+
+        previous_text and next_text give a chunk of a longer script the surrounding context, so its
+        intonation continues across chunk boundaries.
+        """
         try:
             url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
             
@@ -85,30 +219,93 @@ class VideoGenerator:
                     "similarity_boost": 0.5
                 }
             }
+            if previous_text:
+                data["previous_text"] = previous_text
+            if next_text:
+                data["next_text"] = next_text
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, headers=headers, json=data)
-                
-                if response.status_code == 200:
-                    # Save audio file
-                    audio_filename = f"voiceover_{generate_secure_key(8)}.mp3"
-                    audio_path = os.path.join("uploads", "voiceovers", audio_filename)
-                    os.makedirs(os.path.dirname(audio_path), exist_ok=True)
-                    
-                    with open(audio_path, "wb") as f:
+            # Same text, voice, model and settings always produce the same audio
+            cache_key = json.dumps({"voice_id": voice_id, **data}, sort_keys=True)
+            cached = self.voiceover_cache.get(cache_key)
+            if cached:
+                logger.info(f"Voiceover cache hit: {cached}")
+                return cached
+            
+            response = await http_clients.get("elevenlabs").post(url, headers=headers, json=data)
+            
+            if response.status_code == 200:
+                # Save audio file
+                with self.voiceover_cache.writer(cache_key) as temp_path:
+                    with open(temp_path, "wb") as f:
                         f.write(response.content)
-                    
-                    logger.info(f"Generated voiceover: {audio_path}")
-                    return audio_path
-                else:
-                    raise Exception(f"ElevenLabs API error: {response.status_code}")
+                
+                audio_path = self.voiceover_cache.path_for(cache_key)
+                logger.info(f"Generated voiceover: {audio_path}")
+                return audio_path
+            else:
+                raise Exception(f"ElevenLabs API error: {response.status_code}")
                     
         except Exception as e:
             logger.error(f"Voiceover generation error: {e}")
             raise
     
+    async def generate_chunked_voiceover(self, script_data: Dict,
+                                         voice_id: str = "21m00Tcm4TlvDq8ikWAM") -> Tuple[str, List[Dict]]:
+        """Voice the script segment by segment (or sentence by sentence) in parallel and stitch the audio
+
+        Each chunk is voiced with its neighbouring chunks as context (so intonation carries across
+        the joins) and cached on its own, so an edited script only re-voices the changed chunks and
+        their neighbours. Returns the stitched audio path and subtitle segments timed to it.
+        """
+        texts = voiceover_chunks(script_data)
+        if not texts:
+            raise ValueError("Script has no text to voice")
+        
+        slots = asyncio.Semaphore(VOICEOVER_CHUNK_CONCURRENCY)
+        
+        async def voice_chunk(index: int) -> Tuple[str, bytes]:
+            async with slots:
+                chunk_path = await self.generate_voiceover(
+                    texts[index], voice_id,
+                    previous_text=texts[index - 1] if index > 0 else None,
+                    next_text=texts[index + 1] if index + 1 < len(texts) else None
+                )
+            # Decoding overlaps with the chunks still being voiced
+            return chunk_path, await asyncio.to_thread(decode_pcm, chunk_path, VOICEOVER_SAMPLE_RATE)
+        
+        tasks = [asyncio.create_task(voice_chunk(index)) for index in range(len(texts))]
+        try:
+            chunks = await asyncio.gather(*tasks)
+        except BaseException:
+            # One failed chunk fails the voiceover; don't keep paying for the others
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        
+        chunk_paths = [path for path, _ in chunks]
+        pcm_chunks = [pcm for _, pcm in chunks]
+        segments = chunk_timings(pcm_chunks, texts, VOICEOVER_SAMPLE_RATE, VOICEOVER_CHUNK_GAP_SECONDS)
+        if len(chunk_paths) == 1:
+            return chunk_paths[0], segments
+        
+        # Chunk files are content-addressed, so their names identify the stitched audio
+        cache_key = json.dumps({
+            "chunks": [os.path.basename(path) for path in chunk_paths],
+            "gap_seconds": VOICEOVER_CHUNK_GAP_SECONDS,
+            "sample_rate": VOICEOVER_SAMPLE_RATE
+        })
+        audio_path = self.voiceover_cache.get(cache_key)
+        if not audio_path:
+            with self.voiceover_cache.writer(cache_key) as temp_path:
+                await asyncio.to_thread(stitch_pcm, pcm_chunks, temp_path, VOICEOVER_SAMPLE_RATE,
+                                        VOICEOVER_CHUNK_GAP_SECONDS)
+            audio_path = self.voiceover_cache.path_for(cache_key)
+        logger.info(f"Stitched voiceover from {len(chunk_paths)} chunks: {audio_path}")
+        return audio_path, segments
+    
     async def fetch_stock_footage(self, query: str, count: int = 5) -> List[str]:
-        """Fetch stock footage from Pexels API"""
+        """Fetch stock footage from Pexels API, reusing recent results for the same query"""
         try:
             # Using Pexels API for stock footage
             pexels_api_key = os.getenv("PEXELS_API_KEY")
@@ -116,161 +313,158 @@ class VideoGenerator:
                 logger.warning("Pexels API key not found, using placeholder footage")
                 return []
             
-            url = f"https://api.pexels.com/videos/search?query={query}&per_page={count}"
+            fmt = canonical_format()
+            cache_key = f"{' '.join(query.lower().split())}|{count}|{fmt['width']}x{fmt['height']}"
+            found, cached = await asyncio.to_thread(self.stock_search_cache.get, cache_key)
+            if found:
+                logger.info(f"Stock search cache hit: {query}")
+                return cached
+            
+            url = "https://api.pexels.com/videos/search"
+            params = {"query": query, "per_page": count, "orientation": "portrait"}
             headers = {"Authorization": pexels_api_key}
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=headers)
+            response = await http_clients.get("pexels").get(url, params=params, headers=headers)
+            
+            if response.status_code == 200:
+                data = response.json()
+                video_urls = []
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    video_urls = []
-                    
-                    for video in data.get("videos", []):
-                        # Get the smallest video file for faster processing
-                        video_files = video.get("video_files", [])
-                        if video_files:
-                            smallest_file = min(video_files, key=lambda x: x.get("width", 0))
-                            video_urls.append(smallest_file["link"])
-                    
-                    return video_urls[:count]
-                else:
-                    logger.warning(f"Pexels API error: {response.status_code}")
-                    return []
+                for video in data.get("videos", []):
+                    # Get the smallest file that still fills the output frame without upscaling
+                    video_file = select_video_file(video.get("video_files", []), fmt["width"], fmt["height"])
+                    if video_file:
+                        video_urls.append(video_file["link"])
+                
+                video_urls = video_urls[:count]
+                # Empty results are cached too, but briefly, so new uploads show up soon
+                ttl = STOCK_SEARCH_TTL if video_urls else STOCK_SEARCH_NEGATIVE_TTL
+                await asyncio.to_thread(self.stock_search_cache.set, cache_key, video_urls, ttl)
+                return video_urls
+            else:
+                logger.warning(f"Pexels API error: {response.status_code}")
+                return []
                     
         except Exception as e:
             logger.error(f"Stock footage fetch error: {e}")
             return []
     
+    async def download_stock_footage(self, stock_footage: List[str]) -> List[str]:
+        """Download stock clips and normalize them to the canonical format (both cached); failed clips are skipped"""
+        return await self.footage_downloader.fetch_all(stock_footage, normalize=True)
+    
     async def create_video_from_script(self, script_data: Dict, voiceover_path: str, 
-                                     stock_footage: List[str] = None) -> str:
-        """Create final video by combining voiceover and footage"""
+                                     stock_footage: List[str] = None, quality: str = "full",
+                                     profile: str = "default") -> str:
+        """Create final video by combining voiceover and footage
+
+        The full render uses the named encode profile; quality "preview" writes a low-resolution,
+        fast-start render for review before the full encode.
+        """
+        footage_paths = await self.download_stock_footage(stock_footage or [])
+        return await self._create_video_from_script(script_data, voiceover_path, footage_paths,
+                                                    quality, encode_profile(profile))
+    
+    def _join_footage(self, footage_paths: List[str], duration: float, scratch) -> Optional[str]:
+        """Join normalized clips into one background track by stream copy, sharing the duration between them"""
+        durations = []
+        for video_path in footage_paths:
+            try:
+                durations.append(probe_video(video_path)["duration"])
+            except ValueError as e:
+                logger.error(f"Skipping unreadable stock footage {video_path}: {e}")
+                durations.append(0.0)
+        usable = [(path, length) for path, length in zip(footage_paths, durations) if length > 0]
+        if not usable:
+            return None
+        
+        share = duration / len(usable)
+        background_path = scratch.path("background.mp4", expected_size=int(duration * 1024 * 1024))
+        os.makedirs(os.path.dirname(background_path), exist_ok=True)
+        concat_segments([path for path, _ in usable], None, background_path, scratch.path("footage.txt"),
+                        outpoints=[min(share, length) for _, length in usable])
+        return background_path
+    
+    async def _create_video_from_script(self, script_data: Dict, voiceover_path: str,
+                                        footage_paths: List[str], quality: str, profile: Dict) -> str:
         try:
-            from moviepy.editor import AudioFileClip, VideoFileClip, concatenate_videoclips, TextClip, CompositeVideoClip
-            
-            # Load voiceover
-            audio = AudioFileClip(voiceover_path)
-            duration = audio.duration
-            
-            # Create video clips
-            video_clips = []
-            
-            if stock_footage:
-                # Use stock footage
-                for i, video_url in enumerate(stock_footage):
-                    try:
-                        # Download and load video
-                        video_filename = f"stock_{generate_secure_key(8)}.mp4"
-                        video_path = os.path.join("uploads", "temp", video_filename)
-                        os.makedirs(os.path.dirname(video_path), exist_ok=True)
-                        
-                        async with httpx.AsyncClient() as client:
-                            response = await client.get(video_url)
-                            with open(video_path, "wb") as f:
-                                f.write(response.content)
-                        
-                        # Load video clip
-                        clip = VideoFileClip(video_path)
-                        video_clips.append(clip)
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to load stock footage {i}: {e}")
-                        continue
-            else:
-                # Create placeholder video with text
-                placeholder = TextClip(
-                    script_data["title"],
-                    fontsize=60,
-                    color='white',
-                    bg_color='black',
-                    size=(1080, 1920)
-                ).set_duration(duration)
-                video_clips.append(placeholder)
-            
-            # Combine video clips
-            if len(video_clips) > 1:
-                # Distribute clips across duration
-                clip_duration = duration / len(video_clips)
-                for i, clip in enumerate(video_clips):
-                    start_time = i * clip_duration
-                    end_time = min((i + 1) * clip_duration, duration)
-                    video_clips[i] = clip.subclip(0, end_time - start_time)
+            # The joined background lives in job scratch until the render is written
+            with scratch_manager.job() as scratch:
+                duration = await asyncio.to_thread(audio_duration, voiceover_path)
+                background_path = None
+                if footage_paths:
+                    background_path = await asyncio.to_thread(self._join_footage, footage_paths, duration, scratch)
                 
-                video = concatenate_videoclips(video_clips)
-            else:
-                video = video_clips[0]
-            
-            # Add subtitles
-            if script_data.get("segments"):
-                video = self.add_subtitles_to_generated_video(video, script_data["segments"])
-            
-            # Combine video and audio
-            final_video = video.set_audio(audio)
-            
-            # Generate output path
-            output_filename = f"generated_{generate_secure_key(8)}.mp4"
-            output_path = os.path.join("uploads", "generated", output_filename)
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
-            # Write final video
-            final_video.write_videofile(output_path, verbose=False, logger=None)
-            
-            # Clean up
-            audio.close()
-            video.close()
-            final_video.close()
-            
-            return output_path
+                # Generate output path
+                prefix = "preview" if quality == "preview" else "generated"
+                output_filename = f"{prefix}_{generate_secure_key(8)}.mp4"
+                output_path = os.path.join(UPLOAD_DIR, "generated", output_filename)
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                
+                try:
+                    if not background_path:
+                        # No footage (no Pexels key or no results): a still background needs no moviepy
+                        return await asyncio.to_thread(render_title_card_video, script_data, voiceover_path,
+                                                       duration, quality, profile, output_path, scratch)
+                    return await media_pool.run(
+                        render_generated_video, script_data, voiceover_path, background_path, quality, profile,
+                        output_path, timeout=GENERATOR_RENDER_TIMEOUT
+                    )
+                except BaseException:
+                    # A timed out or cancelled render leaves a partial file behind
+                    if os.path.exists(output_path):
+                        os.remove(output_path)
+                    raise
             
         except Exception as e:
             logger.error(f"Video creation error: {e}")
             raise
     
-    def add_subtitles_to_generated_video(self, video, segments: List[Dict]):
-        """Add subtitles to generated video"""
-        try:
-            clips = [video]
-            
-            for segment in segments:
-                start_time = segment["start"]
-                end_time = segment["end"]
-                text = segment["text"]
-                
-                # Create text clip
-                text_clip = TextClip(
-                    text,
-                    fontsize=40,
-                    color='white',
-                    stroke_color='black',
-                    stroke_width=2,
-                    font='Arial-Bold'
-                ).set_position(('center', 'bottom')).set_duration(end_time - start_time)
-                
-                clips.append(text_clip)
-            
-            # Composite video with subtitles
-            final_video = CompositeVideoClip(clips)
-            return final_video
-            
-        except Exception as e:
-            logger.error(f"Subtitle addition error: {e}")
-            return video
+    async def _gather_stock_footage(self, topic: str, metrics: StageMetrics) -> Tuple[List[str], List[str]]:
+        """Search and download footage for a topic; returns (urls, local paths)"""
+        with metrics.stage("stock_footage"):
+            stock_footage = await self.fetch_stock_footage(topic, count=3)
+            return stock_footage, await self.download_stock_footage(stock_footage)
     
     async def generate_complete_video(self, topic: str, duration: int = 60, 
-                                    style: str = "engaging", voice_id: str = "21m00Tcm4TlvDq8ikWAM") -> Dict:
-        """Generate complete video from topic"""
+                                    style: str = "engaging", voice_id: str = "21m00Tcm4TlvDq8ikWAM",
+                                    quality: str = "full", chunked_voiceover: bool = VOICEOVER_CHUNKED) -> Dict:
+        """Generate complete video from topic
+
+        With chunked_voiceover the script is voiced in parallel chunks and the subtitles are timed
+        to the resulting audio instead of the script's planned timestamps.
+        """
+        metrics = StageMetrics()
         try:
-            # Step 1: Generate script
-            script_data = await self.generate_script(topic, duration, style)
-            
-            # Step 2: Generate voiceover
-            voiceover_path = await self.generate_voiceover(script_data["script"], voice_id)
-            
-            # Step 3: Fetch stock footage
-            stock_footage = await self.fetch_stock_footage(topic, count=3)
+            # Footage only depends on the topic, so search and download it while the script and
+            # voiceover are produced
+            footage = asyncio.create_task(self._gather_stock_footage(topic, metrics))
+            try:
+                # Step 1: Generate script
+                with metrics.stage("script"):
+                    script_data = await self.generate_script(topic, duration, style)
+                
+                # Step 2: Generate voiceover
+                with metrics.stage("voiceover"):
+                    if chunked_voiceover:
+                        voiceover_path, segments = await self.generate_chunked_voiceover(script_data, voice_id)
+                        script_data = {**script_data, "segments": segments}
+                    else:
+                        voiceover_path = await self.generate_voiceover(script_data["script"], voice_id)
+                
+                # Step 3: Stock footage
+                stock_footage, footage_paths = await footage
+            finally:
+                if not footage.done():
+                    # Don't leave the download running after the job has failed
+                    footage.cancel()
+                    await asyncio.gather(footage, return_exceptions=True)
             
             # Step 4: Create final video
-            video_path = await self.create_video_from_script(script_data, voiceover_path, stock_footage)
+            with metrics.stage("render"):
+                video_path = await self._create_video_from_script(
+                    script_data, voiceover_path, footage_paths, quality, encode_profile("default")
+                )
             
             return {
                 "topic": topic,
@@ -278,6 +472,8 @@ class VideoGenerator:
                 "voiceover_path": voiceover_path,
                 "video_path": video_path,
                 "stock_footage": stock_footage,
+                "quality": quality,
+                "metrics": metrics.summary(),
                 "generated_at": datetime.utcnow().isoformat()
             }
             
@@ -291,7 +487,7 @@ class VideoGenerator:
             url = "https://api.elevenlabs.io/v1/voices"
             headers = {"xi-api-key": self.elevenlabs_api_key}
             
-            response = httpx.get(url, headers=headers)
+            response = http_clients.get_sync("elevenlabs").get(url, headers=headers)
             
             if response.status_code == 200:
                 voices = response.json().get("voices", [])
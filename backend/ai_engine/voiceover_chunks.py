@@ -0,0 +1,70 @@
+# backend/ai_engine/voiceover_chunks.py
+import re
+import subprocess
+import logging
+from typing import Dict, List
+
+from backend.config import VOICEOVER_SAMPLE_RATE, VOICEOVER_CHUNK_GAP_SECONDS
+from backend.utils.media_utils import get_ffmpeg_binary
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+BYTES_PER_SAMPLE = 2  # mono s16le
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9']+", text.lower())
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in SENTENCE_END.split(text.strip()) if sentence.strip()]
+
+def voiceover_chunks(script_data: Dict) -> List[str]:
+    """Texts to voice separately, in script order
+
+    The script's segments are used when together they spell out the script, so each subtitle keeps
+    its segment; otherwise (segments that only label the script) the script is split into sentences.
+    """
+    script = script_data.get("script", "")
+    segments = [segment.get("text", "").strip() for segment in script_data.get("segments") or []]
+    segments = [text for text in segments if text]
+    if segments and _words(" ".join(segments)) == _words(script):
+        return segments
+    return split_sentences(script)
+
+def decode_pcm(audio_path: str, sample_rate: int = VOICEOVER_SAMPLE_RATE) -> bytes:
+    """Decode an audio file to mono s16le PCM, whose length gives its exact duration"""
+    result = subprocess.run([
+        get_ffmpeg_binary(), "-v", "error", "-i", audio_path,
+        "-vn", "-ac", "1", "-ar", str(sample_rate), "-f", "s16le", "-acodec", "pcm_s16le", "-"
+    ], check=True, capture_output=True)
+    return result.stdout
+
+def audio_duration(audio_path: str, sample_rate: int = VOICEOVER_SAMPLE_RATE) -> float:
+    """Exact duration of an audio file in seconds, from its decoded length"""
+    return len(decode_pcm(audio_path, sample_rate)) / (sample_rate * BYTES_PER_SAMPLE)
+
+def _gap(sample_rate: int, gap_seconds: float) -> bytes:
+    return b"\0" * (int(gap_seconds * sample_rate) * BYTES_PER_SAMPLE)
+
+def chunk_timings(pcm_chunks: List[bytes], texts: List[str], sample_rate: int = VOICEOVER_SAMPLE_RATE,
+                  gap_seconds: float = VOICEOVER_CHUNK_GAP_SECONDS) -> List[Dict]:
+    """Subtitle segments for chunks stitched with stitch_pcm, timed from their sample counts"""
+    bytes_per_second = sample_rate * BYTES_PER_SAMPLE
+    gap = len(_gap(sample_rate, gap_seconds))
+    segments, position = [], 0
+    for index, (pcm, text) in enumerate(zip(pcm_chunks, texts)):
+        if index:
+            position += gap
+        start = position / bytes_per_second
+        position += len(pcm)
+        segments.append({"start": round(start, 3), "end": round(position / bytes_per_second, 3), "text": text})
+    return segments
+
+def stitch_pcm(pcm_chunks: List[bytes], output_path: str, sample_rate: int = VOICEOVER_SAMPLE_RATE,
+               gap_seconds: float = VOICEOVER_CHUNK_GAP_SECONDS):
+    """Join decoded chunks in order, with a short pause between them, and encode one MP3"""
+    subprocess.run([
+        get_ffmpeg_binary(), "-y", "-v", "error", "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "-",
+        "-c:a", "libmp3lame", "-b:a", "128k", "-f", "mp3", output_path
+    ], input=_gap(sample_rate, gap_seconds).join(pcm_chunks), check=True, capture_output=True)
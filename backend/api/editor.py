@@ -0,0 +1,85 @@
+# backend/api/editor.py
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from typing import List, Optional
+import os
+import asyncio
+import logging
+
+from backend.api.auth import get_current_user
+from backend.api.jobs import JobResponse, enqueue_job
+from backend.ai_engine.edl import edl_store
+from backend.config import UPLOAD_DIR, SUPPORTED_ASPECT_RATIOS
+from backend.utils.singleflight import coalesce_key
+from backend.utils.resource_governor import governor, JobRejected
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Pydantic models
+class ProcessVideoRequest(BaseModel):
+    video_path: str
+    platforms: Optional[List[str]] = None
+
+def resolve_upload_path(video_path: str) -> str:
+    """Make sure a client-supplied path points at an existing file inside the upload directory"""
+    upload_root = os.path.realpath(UPLOAD_DIR)
+    resolved = os.path.realpath(video_path)
+    if os.path.commonpath([upload_root, resolved]) != upload_root or not os.path.isfile(resolved):
+        raise HTTPException(status_code=404, detail="Video not found")
+    return resolved
+
+@router.post("/process", response_model=JobResponse, status_code=202)
+async def process_video(request: ProcessVideoRequest, user_id: str = Depends(get_current_user)):
+    """Queue a video for scene detection, transcription and platform edits"""
+    video_path = resolve_upload_path(request.video_path)
+
+    if request.platforms:
+        unknown = [p for p in request.platforms if p not in SUPPORTED_ASPECT_RATIOS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unsupported platforms: {', '.join(unknown)}")
+
+    # Reject videos no worker can take before they reach the queue
+    try:
+        await asyncio.to_thread(governor.admit, video_path)
+    except JobRejected as e:
+        raise HTTPException(status_code=413, detail=e.reason)
+
+    # Double-clicks and client retries attach to the job already in flight
+    dedupe_key = await asyncio.to_thread(
+        coalesce_key, video_path, "process_video", {"platforms": request.platforms, "user_id": user_id}
+    )
+
+    return await enqueue_job("process_video", {
+        "video_path": video_path,
+        "platforms": request.platforms
+    }, user_id, dedupe_key=dedupe_key)
+
+@router.get("/edits/{edl_id}")
+async def get_edit(edl_id: str, user_id: str = Depends(get_current_user)):
+    """Return a planned platform edit and its cached render, if it has been rendered"""
+    if not edl_store.owned_by(edl_id, user_id):
+        raise HTTPException(status_code=404, detail="Edit not found")
+    edl = await asyncio.to_thread(edl_store.load, edl_id)
+    if edl is None:
+        raise HTTPException(status_code=404, detail="Edit not found")
+    return {
+        "edl_id": edl_id,
+        "edl": edl,
+        "output_path": edl_store.cached_render(edl_id),
+        "preview_path": edl_store.cached_render(edl_id, "preview")
+    }
+
+@router.post("/edits/{edl_id}/render", response_model=JobResponse, status_code=202)
+async def render_edit(edl_id: str, quality: str = "preview", user_id: str = Depends(get_current_user)):
+    """Queue a render of a planned edit; quality is "preview" for review or "full" once confirmed
+
+    Cached renders return at once.
+    """
+    if quality not in ("preview", "full"):
+        raise HTTPException(status_code=400, detail="quality must be 'preview' or 'full'")
+    if not edl_store.owned_by(edl_id, user_id) or not edl_store.exists(edl_id):
+        raise HTTPException(status_code=404, detail="Edit not found")
+
+    return await enqueue_job("render_edit", {"edl_id": edl_id, "quality": quality}, user_id,
+                             dedupe_key=f"render_edit:{edl_id}:{quality}:{user_id}")
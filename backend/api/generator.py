@@ -0,0 +1,51 @@
+# backend/api/generator.py
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+import hashlib
+import json
+import logging
+
+from backend.api.auth import get_current_user
+from backend.api.jobs import JobResponse, enqueue_job, get_user_job
+from backend.tasks.job_queue import SUCCEEDED
+from backend.config import ENABLE_AI_VIDEO_GENERATOR, MAX_VIDEO_DURATION
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Pydantic models
+class GenerateVideoRequest(BaseModel):
+    topic: str
+    duration: int = 60
+    style: str = "engaging"
+    voice_id: str = "21m00Tcm4TlvDq8ikWAM"
+    preview: bool = False  # render a low-resolution preview; confirm later for the full render
+
+@router.post("/generate", response_model=JobResponse, status_code=202)
+async def generate_video(request: GenerateVideoRequest, user_id: str = Depends(get_current_user)):
+    """Queue generation of a complete video from a topic"""
+    if not ENABLE_AI_VIDEO_GENERATOR:
+        raise HTTPException(status_code=403, detail="AI video generator is disabled")
+
+    if request.duration <= 0 or request.duration > MAX_VIDEO_DURATION:
+        raise HTTPException(status_code=400, detail=f"Duration must be between 1 and {MAX_VIDEO_DURATION} seconds")
+
+    # Client retries of the same request attach to the job already in flight
+    params = json.dumps({"user_id": user_id, **request.dict()}, sort_keys=True)
+    dedupe_key = f"generate_video:{hashlib.sha256(params.encode()).hexdigest()}"
+
+    return await enqueue_job("generate_video", request.dict(), user_id, dedupe_key=dedupe_key)
+
+@router.post("/generate/{job_id}/render", response_model=JobResponse, status_code=202)
+async def render_full_video(job_id: str, user_id: str = Depends(get_current_user)):
+    """Confirm a previewed video and queue its full-quality render from the same script and voiceover"""
+    job = await get_user_job(job_id, user_id)
+    if job["type"] != "generate_video" or job["status"] != SUCCEEDED:
+        raise HTTPException(status_code=409, detail="Video generation has not finished")
+
+    result = job["result"]
+    return await enqueue_job("render_generated_video", {
+        "script": result["script"],
+        "voiceover_path": result["voiceover_path"],
+        "stock_footage": result.get("stock_footage")
+    }, user_id, dedupe_key=f"render_generated_video:{job_id}")
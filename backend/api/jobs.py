@@ -0,0 +1,113 @@
+# backend/api/jobs.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from typing import Optional
+import asyncio
+import logging
+from datetime import datetime
+
+from backend.api.auth import get_current_user
+from backend.utils.database import get_user_by_id
+from backend.tasks.job_queue import get_job_queue, SUCCEEDED, FAILED
+from backend.utils.metrics import aggregate_stage_metrics
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Pydantic models
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    type: str
+    plan: str
+    status: str
+    attempts: int
+    max_attempts: int
+    error: Optional[str] = None
+    created_at: str
+    updated_at: str
+
+def _timestamp(value: float) -> str:
+    return datetime.utcfromtimestamp(value).isoformat()
+
+async def enqueue_job(job_type: str, payload: dict, user_id: str, dedupe_key: str = None) -> JobResponse:
+    """Enqueue a job in the lane for the user's plan without blocking the event loop
+
+    Requests with the same dedupe_key as a job still in flight get that job's id back.
+    """
+    user_profile = await get_user_by_id(user_id)
+    plan = user_profile.get("plan", "trial") if user_profile else "trial"
+
+    try:
+        job_id = await asyncio.to_thread(
+            get_job_queue().enqueue, job_type, payload, user_id, plan, dedupe_key=dedupe_key
+        )
+        return JobResponse(job_id=job_id, status="queued")
+    except Exception as e:
+        logger.error(f"Failed to enqueue {job_type} job: {e}")
+        raise HTTPException(status_code=503, detail="Job queue unavailable")
+
+async def get_user_job(job_id: str, user_id: str) -> dict:
+    """Get a job, hiding jobs owned by other users"""
+    try:
+        job = await asyncio.to_thread(get_job_queue().get, job_id)
+    except Exception as e:
+        logger.error(f"Failed to read job {job_id}: {e}")
+        raise HTTPException(status_code=503, detail="Job queue unavailable")
+
+    if not job or job["user_id"] != user_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/metrics")
+async def get_stage_metrics(job_type: str = "process_video", limit: int = 200,
+                            user_id: str = Depends(get_current_user)):
+    """Per-stage wall time, CPU time, peak RSS and I/O over recently completed jobs"""
+    try:
+        results = await asyncio.to_thread(get_job_queue().recent_results, job_type, min(limit, 1000))
+    except Exception as e:
+        logger.error(f"Failed to read job metrics: {e}")
+        raise HTTPException(status_code=503, detail="Job queue unavailable")
+
+    summaries = [result["metrics"] for result in results if isinstance(result, dict) and result.get("metrics")]
+    return {
+        "job_type": job_type,
+        "jobs": len(summaries),
+        "stages": aggregate_stage_metrics(summaries)
+    }
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(job_id: str, user_id: str = Depends(get_current_user)):
+    """Get the status of a background job"""
+    job = await get_user_job(job_id, user_id)
+    return JobStatusResponse(
+        job_id=job["id"],
+        type=job["type"],
+        plan=job["plan"],
+        status=job["status"],
+        attempts=job["attempts"],
+        max_attempts=job["max_attempts"],
+        error=job["error"],
+        created_at=_timestamp(job["created_at"]),
+        updated_at=_timestamp(job["updated_at"])
+    )
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str, user_id: str = Depends(get_current_user)):
+    """Get the result of a finished job (202 while it is still pending)"""
+    job = await get_user_job(job_id, user_id)
+
+    if job["status"] == SUCCEEDED:
+        return {"job_id": job["id"], "status": job["status"], "result": job["result"]}
+
+    if job["status"] == FAILED:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Job failed: {job['error']}")
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={"job_id": job["id"], "status": job["status"]}
+    )
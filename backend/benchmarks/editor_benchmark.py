@@ -0,0 +1,261 @@
+# backend/benchmarks/editor_benchmark.py
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import wave
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STAGES = ["detect_scenes", "find_highlight_moments", "generate_thumbnail", "add_subtitles", "create_platform_edit"]
+
+FIXTURE_FPS = 30
+SCENE_SECONDS = 2.0  # a hard cut every scene
+SAMPLE_RATE = 44100
+SUBTITLE_SECONDS = 10  # length of the subtitle composite that is rendered
+EDIT_SECONDS = 15  # length of the platform edit that is rendered
+
+def _scene_images(width: int, height: int, scenes: int) -> List[np.ndarray]:
+    """One textured, distinctly colored background per scene (seeded, so runs are comparable)"""
+    rng = np.random.default_rng(0)
+    tile = 16
+    images = []
+    for index in range(scenes):
+        color = rng.integers(0, 256, size=3)
+        noise = rng.integers(-40, 40, size=(height // tile + 1, width // tile + 1, 1))
+        texture = np.kron(noise, np.ones((tile, tile, 1)))[:height, :width]
+        images.append(np.clip(color + texture, 0, 255).astype(np.uint8))
+    return images
+
+def _write_audio(path: str, seconds: float):
+    """Alternate a sine tone and silence, switching at each scene cut"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    scene = (t // SCENE_SECONDS).astype(int)
+    samples = np.where(scene % 2 == 0, 0.3 * np.sin(2 * np.pi * (440 + 110 * (scene % 4)) * t), 0.0)
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes((samples * 32767).astype(np.int16).tobytes())
+
+def make_fixture(directory: str, width: int, height: int, seconds: int) -> str:
+    """Create (once) a deterministic H.264/AAC test video with hard cuts and tone/silence audio"""
+    from backend.utils.media_utils import get_ffmpeg_binary
+
+    path = os.path.join(directory, f"synthetic_{width}x{height}_{seconds}s.mp4")
+    if os.path.exists(path):
+        return path
+    os.makedirs(directory, exist_ok=True)
+
+    frames = seconds * FIXTURE_FPS
+    scenes = _scene_images(width, height, int(seconds / SCENE_SECONDS) + 1)
+    bar_width = max(2, width // 40)
+
+    raw_path = f"{path}.raw.avi"
+    audio_path = f"{path}.wav"
+    writer = cv2.VideoWriter(raw_path, cv2.VideoWriter_fourcc(*"MJPG"), FIXTURE_FPS, (width, height))
+    try:
+        for index in range(frames):
+            frame = scenes[int(index / (SCENE_SECONDS * FIXTURE_FPS))].copy()
+            # A moving bar gives small frame-to-frame motion inside a scene
+            x = (index * 8) % (width - bar_width)
+            frame[:, x:x + bar_width] = 255 - frame[:, x:x + bar_width]
+            writer.write(frame)
+    finally:
+        writer.release()
+
+    _write_audio(audio_path, seconds)
+    try:
+        subprocess.run([
+            get_ffmpeg_binary(), "-y", "-v", "error", "-i", raw_path, "-i", audio_path,
+            "-c:v", "libx264", "-preset", "ultrafast", "-crf", "20", "-pix_fmt", "yuv420p",
+            "-c:a", "aac", "-shortest", path
+        ], check=True, capture_output=True)
+    finally:
+        os.remove(raw_path)
+        os.remove(audio_path)
+    return path
+
+def synthetic_transcription(seconds: int) -> Dict:
+    """Transcript with one segment per tone scene, so benchmarks never need Whisper"""
+    segments = []
+    for index, start in enumerate(np.arange(0, seconds, SCENE_SECONDS * 2)):
+        end = min(start + SCENE_SECONDS, seconds)
+        segments.append({"id": index, "start": float(start), "end": float(end),
+                         "text": f"Watch scene {index} now"})
+    return {"text": " ".join(s["text"] for s in segments), "segments": segments, "language": "en"}
+
+def _time(fn: Callable[[], object], repeat: int, reset: Optional[Callable[[], None]] = None) -> Tuple[List[float], object]:
+    timings, result = [], None
+    for _ in range(repeat):
+        if reset:
+            reset()
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return timings, result
+
+def _record(fixture: Dict, stage: str, timings: List[float], frames: int, **extra) -> Dict:
+    best = min(timings)
+    record = {
+        "fixture": fixture["name"],
+        "width": fixture["width"],
+        "height": fixture["height"],
+        "seconds": fixture["seconds"],
+        "stage": stage,
+        "frames": frames,
+        "repeat": len(timings),
+        "best_seconds": round(best, 4),
+        "median_seconds": round(statistics.median(timings), 4),
+        "frames_per_second": round(frames / best, 2) if best > 0 else None
+    }
+    record.update(extra)
+    logger.info(f"{fixture['name']} {stage}: {record['best_seconds']}s ({record['frames_per_second']} fps)")
+    return record
+
+def _failed(fixture: Dict, stage: str, error: Exception) -> Dict:
+    logger.error(f"{fixture['name']} {stage} failed: {error}")
+    return {"fixture": fixture["name"], "width": fixture["width"], "height": fixture["height"],
+            "seconds": fixture["seconds"], "stage": stage, "error": str(error)}
+
+def _clear_render_caches():
+    """Drop cached renders and segments so every create_platform_edit run encodes from scratch"""
+    from backend.config import EDL_RENDER_DIR, RENDER_SEGMENT_CACHE_DIR
+    shutil.rmtree(EDL_RENDER_DIR, ignore_errors=True)
+    shutil.rmtree(RENDER_SEGMENT_CACHE_DIR, ignore_errors=True)
+
+def benchmark_fixture(editor, fixture: Dict, stages: List[str], repeat: int) -> List[Dict]:
+    """Time each requested SmartEditor stage on one fixture"""
+    from moviepy.editor import VideoFileClip
+
+    path, seconds = fixture["path"], fixture["seconds"]
+    frames = seconds * FIXTURE_FPS
+    transcription = synthetic_transcription(seconds)
+    records = []
+
+    timings, scenes = _time(lambda: editor.detect_scenes(path), repeat)
+    if "detect_scenes" in stages:
+        records.append(_record(fixture, "detect_scenes", timings, frames, scenes=len(scenes)))
+
+    timings, highlights = _time(lambda: editor.find_highlight_moments(path, scenes, transcription), repeat)
+    if "find_highlight_moments" in stages:
+        # Each scene's frame is decoded once
+        records.append(_record(fixture, "find_highlight_moments", timings, max(1, len(scenes)),
+                               highlights=len(highlights)))
+
+    if "generate_thumbnail" in stages:
+        # Every run writes a new thumbnail; remove them all once timing is done
+        thumbnails = []
+        timings, _ = _time(lambda: thumbnails.append(editor.generate_thumbnail(path, highlights)), repeat)
+        for thumbnail in filter(None, thumbnails):
+            os.remove(thumbnail)
+        records.append(_record(fixture, "generate_thumbnail", timings, 1))
+
+    if "add_subtitles" in stages:
+        clip_seconds = min(SUBTITLE_SECONDS, seconds)
+        subtitle_frames = clip_seconds * FIXTURE_FPS
+
+        def render_subtitles():
+            source = VideoFileClip(path)
+            try:
+                clip = source.subclip(0, clip_seconds)
+                composite = editor.add_subtitles(clip, transcription["segments"], 0)
+                for t in np.arange(subtitle_frames) / FIXTURE_FPS:
+                    composite.get_frame(t)
+                # add_subtitles falls back to the bare clip when captions cannot be drawn (no ImageMagick)
+                return composite is not clip
+            finally:
+                source.close()
+
+        try:
+            timings, composited = _time(render_subtitles, repeat)
+            records.append(_record(fixture, "add_subtitles", timings, subtitle_frames, subtitles_drawn=composited))
+        except Exception as e:
+            records.append(_failed(fixture, "add_subtitles", e))
+
+    if "create_platform_edit" in stages:
+        edit_seconds = min(EDIT_SECONDS, seconds)
+        try:
+            timings, _ = _time(
+                lambda: editor.create_platform_edit(path, "tiktok", highlights, transcription, duration=edit_seconds),
+                repeat, reset=_clear_render_caches
+            )
+            records.append(_record(fixture, "create_platform_edit", timings, edit_seconds * FIXTURE_FPS,
+                                   platform="tiktok"))
+        except Exception as e:
+            records.append(_failed(fixture, "create_platform_edit", e))
+
+    return records
+
+def _environment() -> Dict:
+    import moviepy
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "moviepy": moviepy.__version__
+    }
+
+def run(workdir: str, resolutions: List[Tuple[int, int]], durations: List[int], stages: List[str],
+        repeat: int) -> Dict:
+    from backend.ai_engine.smart_editor import SmartEditor
+
+    editor = SmartEditor()
+    records = []
+    for width, height in resolutions:
+        for seconds in durations:
+            path = make_fixture(os.path.join(workdir, "fixtures"), width, height, seconds)
+            fixture = {"name": os.path.basename(path), "path": path, "width": width,
+                       "height": height, "seconds": seconds}
+            records.extend(benchmark_fixture(editor, fixture, stages, repeat))
+
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "environment": _environment(),
+        "repeat": repeat,
+        "results": records
+    }
+
+def _resolution(value: str) -> Tuple[int, int]:
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time SmartEditor stages on synthetic videos")
+    parser.add_argument("--resolutions", nargs="+", type=_resolution, default=[(640, 360), (1280, 720), (1920, 1080)],
+                        help="fixture sizes as WIDTHxHEIGHT")
+    parser.add_argument("--durations", nargs="+", type=int, default=[10, 30], help="fixture lengths in seconds")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage; the best is reported")
+    parser.add_argument("--workdir", default="benchmark_runs", help="fixtures and render output")
+    parser.add_argument("-o", "--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    # Keep benchmark renders and caches out of the real upload directory; config reads this on import
+    os.environ["UPLOAD_DIR"] = os.path.join(os.path.abspath(args.workdir), "uploads")
+
+    report = run(args.workdir, args.resolutions, args.durations, args.stages, max(1, args.repeat))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,10 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Relative storage paths are resolved against the backend directory, so the API (started from backend/)
+# and the worker (started from the repo root) use the same files
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # App Configuration
 APP_NAME = "AdForgeAI"
 APP_VERSION = "1.0.0"
@@ -47,7 +51,7 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 # File Storage
-UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+UPLOAD_DIR = os.path.join(BACKEND_DIR, os.getenv("UPLOAD_DIR", "uploads"))
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB
 ALLOWED_VIDEO_TYPES = [".mp4", ".mov", ".avi", ".mkv"]
 ALLOWED_IMAGE_TYPES = [".jpg", ".jpeg", ".png", ".gif"]
@@ -58,7 +62,8 @@ BASIC_PLAN_LIMITS = {
     "daily_ai_captions": 30,
     "daily_subtitles": 20,
     "storage_gb": 2,
-    "monthly_videos": 30
+    "monthly_videos": 30,
+    "concurrent_jobs": 1
 }
 
 PRO_PLAN_LIMITS = {
@@ -66,7 +71,8 @@ PRO_PLAN_LIMITS = {
     "daily_ai_captions": 100,
     "daily_subtitles": 100,
     "storage_gb": 10,
-    "monthly_videos": 500
+    "monthly_videos": 500,
+    "concurrent_jobs": 3
 }
 
 TRIAL_LIMITS = {
@@ -74,7 +80,8 @@ TRIAL_LIMITS = {
     "daily_ai_captions": 10,
     "daily_subtitles": 5,
     "storage_gb": 0.5,
-    "trial_days": 15
+    "trial_days": 15,
+    "concurrent_jobs": 1
 }
 
 # Video Processing
@@ -87,10 +94,144 @@ SUPPORTED_ASPECT_RATIOS = {
     "youtube": (16, 9)
 }
 
+# Encode Profiles (output caps and x264/AAC settings applied by every render path)
+ENCODE_PROFILES = {
+    "default": {
+        "max_width": 1080, "max_height": 1920, "fps": 30, "crf": 23, "maxrate": "6M",
+        "preset": "medium", "audio_bitrate": "128k", "faststart": True
+    },
+    "tiktok": {
+        "max_width": 1080, "max_height": 1920, "fps": 30, "crf": 23, "maxrate": "6M",
+        "preset": "medium", "audio_bitrate": "128k", "faststart": True
+    },
+    "youtube_shorts": {
+        "max_width": 1080, "max_height": 1920, "fps": 60, "crf": 21, "maxrate": "10M",
+        "preset": "medium", "audio_bitrate": "192k", "faststart": True
+    },
+    "instagram_reels": {
+        "max_width": 1080, "max_height": 1920, "fps": 30, "crf": 23, "maxrate": "5M",
+        "preset": "medium", "audio_bitrate": "128k", "faststart": True
+    },
+    "instagram_post": {
+        "max_width": 1080, "max_height": 1080, "fps": 30, "crf": 23, "maxrate": "5M",
+        "preset": "medium", "audio_bitrate": "128k", "faststart": True
+    },
+    "youtube": {
+        "max_width": 1920, "max_height": 1080, "fps": 60, "crf": 21, "maxrate": "12M",
+        "preset": "medium", "audio_bitrate": "192k", "faststart": True
+    }
+}
+
+# Rendering (long edits are split into segments encoded in parallel)
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+RENDER_SEGMENT_SECONDS = 10  # segment length on the source timeline
+RENDER_SEGMENT_MIN_DURATION = 20  # shorter edits are encoded in a single pass
+RENDER_SEGMENT_CACHE_DIR = os.path.join(UPLOAD_DIR, "segments")  # encoded segments reused across re-renders
+RENDER_SEGMENT_CACHE_BYTES = int(float(os.getenv("RENDER_SEGMENT_CACHE_GB", "10")) * 1024 * 1024 * 1024)
+# moviepy renders run in separate processes so they never block an event loop
+MEDIA_PROCESS_WORKERS = int(os.getenv("MEDIA_PROCESS_WORKERS", "2"))  # concurrent renders per event loop
+GENERATOR_RENDER_TIMEOUT = int(os.getenv("GENERATOR_RENDER_TIMEOUT", "1800"))  # seconds per generated video
+
+# Preview Renders (low resolution, fast preset and short GOP for in-browser playback)
+PREVIEW_MAX_DIMENSION = int(os.getenv("PREVIEW_MAX_DIMENSION", "640"))  # longest side in pixels
+PREVIEW_ENCODE_SETTINGS = {
+    "preset": "ultrafast",
+    "crf": 32,
+    "gop_seconds": 1,
+    "audio_bitrate": "64k",
+    "faststart": True
+}
+
+# Stock Footage (downloads are cached by URL and evicted least recently used)
+STOCK_CACHE_DIR = os.path.join(UPLOAD_DIR, "stock_cache")
+STOCK_CACHE_BYTES = int(float(os.getenv("STOCK_CACHE_GB", "5")) * 1024 * 1024 * 1024)
+STOCK_DOWNLOAD_CONCURRENCY = 4
+STOCK_SEARCH_TTL = int(os.getenv("STOCK_SEARCH_TTL", "3600"))  # seconds a search result is reused
+STOCK_SEARCH_NEGATIVE_TTL = 300  # seconds an empty result is reused
+STOCK_SEARCH_CACHE_SIZE = 512  # results kept in each process
+STOCK_MAX_DOWNLOAD_BYTES = 200 * 1024 * 1024  # 200MB per clip
+STOCK_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Clips are transcoded once to the generator's canonical format (the "default" encode profile's
+# size and fps) so generated videos can join them without re-encoding
+STOCK_NORMALIZED_DIR = os.path.join(UPLOAD_DIR, "stock_normalized")
+STOCK_NORMALIZED_BYTES = int(float(os.getenv("STOCK_NORMALIZED_GB", "5")) * 1024 * 1024 * 1024)
+STOCK_NORMALIZED_GOP_SECONDS = 1
+
+# Voiceovers (content-addressed by text, voice and settings; evicted least recently used)
+VOICEOVER_CACHE_DIR = os.path.join(UPLOAD_DIR, "voiceovers")
+VOICEOVER_CACHE_BYTES = int(float(os.getenv("VOICEOVER_CACHE_GB", "2")) * 1024 * 1024 * 1024)
+# Chunked voiceovers: the script is voiced segment by segment (or sentence by sentence) in parallel
+# and stitched, which also times the subtitles to the actual speech (opt-in)
+VOICEOVER_CHUNKED = os.getenv("VOICEOVER_CHUNKED", "false").lower() == "true"
+VOICEOVER_CHUNK_CONCURRENCY = 3
+VOICEOVER_CHUNK_GAP_SECONDS = 0.25  # pause inserted between chunks
+VOICEOVER_SAMPLE_RATE = 44100
+
+# Edit Decision Lists (platform edits are planned eagerly and rendered on demand)
+EDL_DIR = os.path.join(UPLOAD_DIR, "edl")
+EDL_RENDER_DIR = os.path.join(UPLOAD_DIR, "edited")  # cached renders, one per EDL
+
+# Timeline Assets (editor scrubbing previews and waveform)
+TIMELINE_DIR = os.path.join(UPLOAD_DIR, "timeline")
+TIMELINE_SPRITE_INTERVAL = float(os.getenv("TIMELINE_SPRITE_INTERVAL", "2"))  # seconds between tiles
+TIMELINE_TILE_WIDTH = 160
+TIMELINE_SHEET_COLUMNS = 10
+TIMELINE_SHEET_ROWS = 10
+WAVEFORM_SAMPLE_RATE = 8000
+WAVEFORM_PEAKS_PER_SECOND = 50
+
+# Resource Governor (per-node caps on heavy media stages)
+GOVERNOR_LOCK_DIR = os.getenv("GOVERNOR_LOCK_DIR", "/tmp/adforgeai-governor")
+MAX_CONCURRENT_CPU_STAGES = int(os.getenv("MAX_CONCURRENT_CPU_STAGES", str(max(1, (os.cpu_count() or 2) // 2))))
+NODE_MEMORY_BUDGET_MB = int(os.getenv("NODE_MEMORY_BUDGET_MB", "4096"))
+MEMORY_SLOT_MB = 256
+GOVERNOR_WAIT_TIMEOUT = 30  # seconds a stage waits for capacity before the job is deferred
+GOVERNOR_RETRY_AFTER = 60  # seconds before a deferred job is retried
+
+# Scratch Space (per-job temporary media files)
+SCRATCH_DIR = os.getenv("SCRATCH_DIR", os.path.join(UPLOAD_DIR, "scratch"))
+SCRATCH_TMPFS_DIR = os.getenv("SCRATCH_TMPFS_DIR", "/dev/shm/adforgeai")  # small intermediates stay in RAM
+SCRATCH_TMPFS_MAX_FILE = 64 * 1024 * 1024  # 64MB
+SCRATCH_QUOTA_BYTES = int(float(os.getenv("SCRATCH_QUOTA_GB", "20")) * 1024 * 1024 * 1024)
+SCRATCH_WAIT_TIMEOUT = 120  # seconds to wait for quota before failing the job
+
+# Pipeline checkpoints (per-stage outputs kept until a job finishes)
+CHECKPOINT_DIR = os.path.join(UPLOAD_DIR, "checkpoints")
+CHECKPOINT_TTL = int(os.getenv("CHECKPOINT_TTL", str(24 * 3600)))  # seconds before an abandoned job's checkpoints are swept
+
 # AI Configuration
 GPT_MODEL = "gpt-4o"
 MAX_TOKENS = 1000
 TEMPERATURE = 0.7
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))  # seconds per request
+OPENAI_MAX_RETRIES = 2
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))  # in-flight script generations per process
+
+# Outbound HTTP (one pooled, keep-alive client per upstream service; HTTP/2 where supported)
+HTTP_KEEPALIVE_EXPIRY = 30  # seconds an idle connection is kept open
+HTTP_CLIENT_PROFILES = {
+    "default": {
+        "http2": False, "max_connections": 20, "max_keepalive_connections": 10,
+        "timeout": 30.0, "connect_timeout": 10.0
+    },
+    "openai": {
+        "http2": True, "max_connections": OPENAI_MAX_CONCURRENCY, "max_keepalive_connections": OPENAI_MAX_CONCURRENCY,
+        "timeout": OPENAI_TIMEOUT, "connect_timeout": 10.0
+    },
+    "elevenlabs": {
+        "http2": True, "max_connections": 10, "max_keepalive_connections": 5,
+        "timeout": 120.0, "connect_timeout": 10.0
+    },
+    "pexels": {
+        "http2": True, "max_connections": 10, "max_keepalive_connections": 5,
+        "timeout": 15.0, "connect_timeout": 5.0
+    },
+    # Stock footage files from CDNs; large bodies, so a long read timeout
+    "downloads": {
+        "http2": False, "max_connections": 16, "max_keepalive_connections": 8,
+        "timeout": 120.0, "connect_timeout": 10.0
+    }
+}
 
 # Email Configuration (for notifications)
 SMTP_HOST = os.getenv("SMTP_HOST")
@@ -101,6 +242,25 @@ FROM_EMAIL = os.getenv("FROM_EMAIL", "noreply@adforgeai.com")
 
 # Redis (for caching and background tasks)
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "redis" if os.getenv("REDIS_URL") else "local")
+
+# Background Jobs (Redis when REDIS_URL is set, otherwise a local SQLite file)
+JOB_QUEUE_BACKEND = os.getenv("JOB_QUEUE_BACKEND", "redis" if os.getenv("REDIS_URL") else "sqlite")
+JOB_QUEUE_DB_PATH = os.path.join(BACKEND_DIR, os.getenv("JOB_QUEUE_DB_PATH", "jobs.db"))
+JOB_VISIBILITY_TIMEOUT = int(os.getenv("JOB_VISIBILITY_TIMEOUT", "300"))  # seconds before an unacked job is retried
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BACKOFF = 30  # seconds, doubled on each attempt
+JOB_RESULT_TTL = 7 * 24 * 60 * 60  # keep finished jobs for 7 days
+JOB_POLL_INTERVAL = 1.0  # seconds between polls when the queue is empty
+
+# Job Scheduling (weighted-fair share of workers per plan)
+PLAN_SCHEDULING_WEIGHTS = {
+    "pro": 6,
+    "basic": 3,
+    "trial": 1
+}
+JOB_STARVATION_SECONDS = int(os.getenv("JOB_STARVATION_SECONDS", "600"))  # a lane waiting this long may jump ahead
+JOB_STARVATION_SHARE = 5  # ...but for at most 1 in this many dequeues
 
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
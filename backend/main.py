@@ -7,9 +7,10 @@ import asyncio
 from datetime import datetime
 
 # Import routers
-from backend.api import auth, upload, editor, generator, social, billing, analytics
+from backend.api import auth, upload, editor, generator, social, billing, analytics, jobs
 from backend.tasks.scheduler import start_post_scheduler
 from backend.utils.database import init_db
+from backend.utils.http_clients import http_clients
 
 # Create FastAPI app
 app = FastAPI(
@@ -40,6 +41,7 @@ app.include_router(generator.router, prefix="/api/generator", tags=["AI Generato
 app.include_router(social.router, prefix="/api/social", tags=["Social Media"])
 app.include_router(billing.router, prefix="/api/billing", tags=["Billing"])
 app.include_router(analytics.router, prefix="/api/analytics", tags=["Analytics"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Background Jobs"])
 
 # Health check endpoint
 @app.get("/")
@@ -64,6 +66,9 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     print("Shutting down AdForgeAI API...")
+    # Drain pooled outbound connections
+    await http_clients.aclose()
+    http_clients.close()
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -0,0 +1,169 @@
+# backend/tasks/batch.py
+"""Reprocess a library of local videos without the API or job queue
+
+    python -m backend.tasks.batch /path/to/videos --output results.jsonl --jobs 4
+
+The input is a directory (searched recursively) or a manifest file with one video path per
+line, or JSON lines with "video_path" and optional "platforms". Each finished video appends
+one JSON line to the output; videos already recorded there with the same content hash, platforms
+and render option are skipped, so an interrupted run can simply be restarted. Everything runs against local files;
+the Whisper model must already be in the local cache.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from backend.config import ALLOWED_VIDEO_TYPES, LOG_LEVEL
+from backend.utils.media_utils import hash_file
+from backend.utils.resource_governor import JobRejected
+from backend.utils.scratch import scratch_manager
+
+logger = logging.getLogger(__name__)
+
+# One editor per pool process so the Whisper model is loaded once, not per video
+_editor = None
+
+def _init_worker():
+    global _editor
+    logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    from backend.ai_engine.smart_editor import SmartEditor
+    _editor = SmartEditor()
+
+def _process(item: Dict, render: bool) -> Dict:
+    """Process one video in a pool process and describe the outcome"""
+    started = time.monotonic()
+    cpu_started = time.process_time()
+    record = {"video_path": item["video_path"], "sha256": item["sha256"], "platforms": item.get("platforms"),
+              "render": render}
+    while True:
+        try:
+            with scratch_manager.job():
+                result = _editor.process_video(item["video_path"], item.get("platforms"))
+                if render:
+                    result["renders"] = {
+                        platform: _editor.render_edl(edl_id) if edl_id else None
+                        for platform, edl_id in result["edits"].items()
+                    }
+            record.update(status="succeeded", result=result)
+        except JobRejected as e:
+            if e.retry_after is not None:
+                # The node is busy with other work; wait for capacity as the queue worker would
+                logger.info(f"Retrying {item['video_path']} in {e.retry_after}s: {e.reason}")
+                time.sleep(e.retry_after)
+                continue
+            record.update(status="rejected", error=e.reason)
+        except Exception as e:
+            record.update(status="failed", error=str(e))
+        break
+    record.update(
+        wall_seconds=round(time.monotonic() - started, 3),
+        cpu_seconds=round(time.process_time() - cpu_started, 3),
+        finished_at=datetime.utcnow().isoformat()
+    )
+    return record
+
+def collect_inputs(source: str, platforms: Optional[List[str]] = None) -> List[Dict]:
+    """Videos to process from a directory or a manifest file"""
+    if os.path.isdir(source):
+        items = []
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() in ALLOWED_VIDEO_TYPES:
+                    items.append({"video_path": os.path.join(root, name), "platforms": platforms})
+        return sorted(items, key=lambda item: item["video_path"])
+
+    items = []
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            item = json.loads(line) if line.startswith("{") else {"video_path": line}
+            item.setdefault("platforms", platforms)
+            # Relative manifest entries are relative to the manifest
+            item["video_path"] = os.path.join(base, item["video_path"])
+            items.append(item)
+    return items
+
+def run_key(sha256: str, platforms: Optional[List[str]], render: bool) -> Tuple:
+    """Identifies one video processed with one set of options"""
+    return sha256, tuple(sorted(platforms)) if platforms else None, bool(render)
+
+def completed_runs(output_path: str) -> Set[Tuple]:
+    """Run keys of videos the output manifest already records as processed"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A run killed mid-write leaves a partial last line
+                continue
+            if record.get("status") == "succeeded":
+                done.add(run_key(record["sha256"], record.get("platforms"), record.get("render", False)))
+    return done
+
+def run_batch(source: str, output_path: str, jobs: int = 1, platforms: Optional[List[str]] = None,
+              render: bool = False) -> Dict:
+    """Process every video from source that is not yet in output_path; returns a status count"""
+    done = completed_runs(output_path)
+    pending, counts = [], {"skipped": 0, "missing": 0}
+    for item in collect_inputs(source, platforms):
+        if not os.path.isfile(item["video_path"]):
+            logger.warning(f"Skipping missing file {item['video_path']}")
+            counts["missing"] += 1
+            continue
+        item["sha256"] = hash_file(item["video_path"])
+        key = run_key(item["sha256"], item.get("platforms"), render)
+        if key in done:
+            counts["skipped"] += 1
+            continue
+        # The same file listed twice with the same options is processed once
+        done.add(key)
+        pending.append(item)
+
+    logger.info(f"Processing {len(pending)} videos on {jobs} processes ({counts['skipped']} already done)")
+    started = time.monotonic()
+    with open(output_path, "a") as out:
+        # spawn keeps pool processes free of the parent's threads and open readers
+        with ProcessPoolExecutor(max_workers=max(1, jobs), initializer=_init_worker,
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = {pool.submit(_process, item, render): item for item in pending}
+            for future in as_completed(futures):
+                record = future.result()
+                out.write(json.dumps(record, default=str) + "\n")
+                out.flush()
+                counts[record["status"]] = counts.get(record["status"], 0) + 1
+                logger.info(f"{record['status']}: {record['video_path']} in {record['wall_seconds']:.1f}s")
+
+    counts["wall_seconds"] = round(time.monotonic() - started, 3)
+    return counts
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run process_video over a directory or manifest of local videos")
+    parser.add_argument("source", help="directory of videos or manifest file (paths or JSON lines)")
+    parser.add_argument("-o", "--output", default="batch_results.jsonl", help="JSON-lines results manifest")
+    parser.add_argument("-j", "--jobs", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="videos processed in parallel")
+    parser.add_argument("-p", "--platforms", nargs="+", help="platforms to plan edits for")
+    parser.add_argument("--render", action="store_true", help="also render every planned edit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    scratch_manager.sweep_stale()
+    counts = run_batch(args.source, args.output, args.jobs, args.platforms, args.render)
+    print(json.dumps(counts))
+    return 1 if counts.get("failed") else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,560 @@
+# backend/tasks/job_queue.py
+import json
+import os
+import sqlite3
+import time
+import uuid
+import logging
+from contextlib import closing
+from typing import Dict, List, Optional
+
+from backend.config import (
+    JOB_QUEUE_BACKEND, JOB_QUEUE_DB_PATH, REDIS_URL, JOB_VISIBILITY_TIMEOUT,
+    JOB_MAX_ATTEMPTS, JOB_RETRY_BACKOFF, JOB_RESULT_TTL
+)
+from backend.tasks.scheduling import PlanScheduler, normalize_plan
+
+logger = logging.getLogger(__name__)
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+def _retry_delay(attempts: int) -> float:
+    """Exponential backoff before a failed job becomes visible again"""
+    return JOB_RETRY_BACKOFF * (2 ** max(0, attempts - 1))
+
+class SQLiteJobQueue:
+    """Job queue stored in a local SQLite file, used when Redis is not configured"""
+
+    def __init__(self, db_path: str = JOB_QUEUE_DB_PATH, visibility_timeout: int = JOB_VISIBILITY_TIMEOUT):
+        self.db_path = db_path
+        self.visibility_timeout = visibility_timeout
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    type TEXT NOT NULL,
+                    user_id TEXT,
+                    plan TEXT NOT NULL DEFAULT 'trial',
+                    dedupe_key TEXT,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    lease_id TEXT,
+                    lease_expires_at REAL,
+                    available_at REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            columns = [row["name"] for row in conn.execute("PRAGMA table_info(jobs)")]
+            if "plan" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN plan TEXT NOT NULL DEFAULT 'trial'")
+            if "dedupe_key" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN dedupe_key TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_dedupe ON jobs (dedupe_key, status)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, available_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_user_status ON jobs (user_id, status)")
+        self.scheduler = PlanScheduler()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _row_to_job(self, row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def enqueue(self, job_type: str, payload: Dict, user_id: str = None, plan: str = "trial",
+                max_attempts: int = JOB_MAX_ATTEMPTS, dedupe_key: str = None) -> str:
+        """Add a job to its plan's lane and return its id
+
+        If dedupe_key matches a job that is still queued or running, that job's id is returned instead.
+        """
+        job_id = uuid.uuid4().hex
+        plan = normalize_plan(plan)
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if dedupe_key:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE dedupe_key = ? AND status IN (?, ?) LIMIT 1",
+                    (dedupe_key, QUEUED, RUNNING)
+                ).fetchone()
+                if row is not None:
+                    conn.execute("COMMIT")
+                    logger.info(f"Coalesced {job_type} request into job {row['id']}")
+                    return row["id"]
+            conn.execute(
+                "INSERT INTO jobs (id, type, user_id, plan, dedupe_key, payload, status, max_attempts, available_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, job_type, user_id, plan, dedupe_key, json.dumps(payload), QUEUED, max_attempts, now, now, now)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        logger.info(f"Enqueued {job_type} job {job_id} ({plan})")
+        return job_id
+
+    def dequeue(self) -> Optional[Dict]:
+        """Lease the next job chosen by the plan scheduler, or return None if nothing is ready"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # Leases that ran out on their last attempt are not retried again
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, lease_id = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_expires_at <= ? AND attempts >= max_attempts",
+                (FAILED, "Visibility timeout exceeded", now, RUNNING, now)
+            )
+            # Other expired leases go back into their lane
+            conn.execute(
+                "UPDATE jobs SET status = ?, lease_id = NULL, available_at = lease_expires_at, updated_at = ? "
+                "WHERE status = ? AND lease_expires_at <= ?",
+                (QUEUED, now, RUNNING, now)
+            )
+
+            waiting_since = {
+                lane["plan"]: lane["oldest"]
+                for lane in conn.execute(
+                    "SELECT plan, MIN(available_at) AS oldest FROM jobs WHERE status = ? AND available_at <= ? GROUP BY plan",
+                    (QUEUED, now)
+                )
+            }
+            caps = self.scheduler.lane_caps()
+            row = None
+            for plan in self.scheduler.order_lanes(waiting_since, now):
+                # Oldest job in the lane whose owner is still under the plan's concurrency cap
+                row = conn.execute(
+                    "SELECT id FROM jobs j WHERE j.status = ? AND j.available_at <= ? AND j.plan = ? AND ("
+                    "j.user_id IS NULL OR (SELECT COUNT(*) FROM jobs r WHERE r.user_id = j.user_id AND r.status = ?) < ?"
+                    ") ORDER BY j.available_at LIMIT 1",
+                    (QUEUED, now, plan, RUNNING, caps[plan])
+                ).fetchone()
+                if row is not None:
+                    self.scheduler.charge(plan)
+                    break
+
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            lease_id = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_id = ?, lease_expires_at = ?, updated_at = ? "
+                "WHERE id = ?",
+                (RUNNING, lease_id, now + self.visibility_timeout, now, row["id"])
+            )
+            job = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+            conn.execute("COMMIT")
+            return self._row_to_job(job)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def heartbeat(self, job_id: str, lease_id: str) -> bool:
+        """Extend a running job's lease; returns False if the lease was lost"""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? WHERE id = ? AND lease_id = ? AND status = ?",
+                (now + self.visibility_timeout, now, job_id, lease_id, RUNNING)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, lease_id: str, result: Dict) -> bool:
+        """Store a job's result and mark it succeeded"""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_id = NULL, updated_at = ? "
+                "WHERE id = ? AND lease_id = ? AND status = ?",
+                (SUCCEEDED, json.dumps(result), now, job_id, lease_id, RUNNING)
+            )
+            self._purge_finished(conn, now)
+            return cursor.rowcount == 1
+
+    def release(self, job_id: str, lease_id: str, delay: float) -> bool:
+        """Put a job back in its lane after `delay` seconds without using up an attempt"""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts - 1, lease_id = NULL, available_at = ?, updated_at = ? "
+                "WHERE id = ? AND lease_id = ? AND status = ?",
+                (QUEUED, now + delay, now, job_id, lease_id, RUNNING)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: str, lease_id: str, error: str, retry: bool = True) -> bool:
+        """Record a failed attempt, scheduling a retry while attempts remain"""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND lease_id = ? AND status = ?",
+                (job_id, lease_id, RUNNING)
+            ).fetchone()
+            if row is None:
+                return False
+            if retry and row["attempts"] < row["max_attempts"]:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, lease_id = NULL, available_at = ?, updated_at = ? WHERE id = ?",
+                    (QUEUED, error, now + _retry_delay(row["attempts"]), now, job_id)
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, lease_id = NULL, updated_at = ? WHERE id = ?",
+                    (FAILED, error, now, job_id)
+                )
+            return True
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Get a job by id"""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return self._row_to_job(row) if row else None
+
+    def recent_results(self, job_type: str, limit: int = 200) -> List[Dict]:
+        """Results of the most recently succeeded jobs of a type"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT result FROM jobs WHERE type = ? AND status = ? ORDER BY updated_at DESC LIMIT ?",
+                (job_type, SUCCEEDED, limit)
+            ).fetchall()
+            return [json.loads(row["result"]) for row in rows if row["result"]]
+
+    def _purge_finished(self, conn: sqlite3.Connection, now: float):
+        conn.execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+            (SUCCEEDED, FAILED, now - JOB_RESULT_TTL)
+        )
+
+# Create a job and add it to its lane, unless the dedupe key (KEYS[3], when given) still points at
+# a queued or running job; returns the id of the job that will do the work
+_ENQUEUE_SCRIPT = """
+local job_id, job_prefix, ttl = ARGV[1], ARGV[2], ARGV[3]
+if KEYS[3] then
+    local existing = redis.call('GET', KEYS[3])
+    if existing then
+        local status = redis.call('HGET', job_prefix .. existing, 'status')
+        if status == 'queued' or status == 'running' then
+            return existing
+        end
+    end
+    redis.call('SET', KEYS[3], job_id, 'EX', ttl)
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 4))
+redis.call('LPUSH', KEYS[2], job_id)
+return job_id
+"""
+
+# Promote due retries and recover expired leases back into their plan lanes
+_RECOVER_SCRIPT = """
+local now = tonumber(ARGV[1])
+local job_prefix, ready_prefix, result_ttl = ARGV[2], ARGV[3], ARGV[4]
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now)
+for _, id in ipairs(due) do
+    redis.call('ZREM', KEYS[1], id)
+    local plan = redis.call('HGET', job_prefix .. id, 'plan') or 'trial'
+    redis.call('HSET', job_prefix .. id, 'updated_at', now)
+    redis.call('LPUSH', ready_prefix .. plan, id)
+end
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now)
+for _, id in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], id)
+    local key = job_prefix .. id
+    local user = redis.call('HGET', key, 'user_id') or ''
+    if user ~= '' then
+        redis.call('HINCRBY', KEYS[3], user, -1)
+    end
+    local attempts = tonumber(redis.call('HGET', key, 'attempts') or '0')
+    local max_attempts = tonumber(redis.call('HGET', key, 'max_attempts') or '1')
+    if attempts >= max_attempts then
+        redis.call('HSET', key, 'status', 'failed', 'error', 'Visibility timeout exceeded', 'lease_id', '', 'updated_at', now)
+        redis.call('EXPIRE', key, result_ttl)
+    else
+        local plan = redis.call('HGET', key, 'plan') or 'trial'
+        redis.call('HSET', key, 'status', 'queued', 'lease_id', '', 'updated_at', now)
+        redis.call('RPUSH', ready_prefix .. plan, id)
+    end
+end
+return #due + #expired
+"""
+
+# Lease the oldest job, lane by lane in scheduler order, whose owner is under the lane's cap
+_DEQUEUE_SCRIPT = """
+local now, deadline, lease_id = ARGV[1], ARGV[2], ARGV[3]
+local job_prefix, ready_prefix = ARGV[4], ARGV[5]
+local depth = tonumber(ARGV[6])
+for i = 7, #ARGV, 2 do
+    local plan, cap = ARGV[i], tonumber(ARGV[i + 1])
+    local lane = ready_prefix .. plan
+    local ids = redis.call('LRANGE', lane, -depth, -1)
+    for j = #ids, 1, -1 do
+        local id = ids[j]
+        local key = job_prefix .. id
+        local user = redis.call('HGET', key, 'user_id') or ''
+        local running = tonumber(redis.call('HGET', KEYS[2], user) or '0')
+        if user == '' or running < cap then
+            redis.call('LREM', lane, -1, id)
+            if user ~= '' then
+                redis.call('HINCRBY', KEYS[2], user, 1)
+            end
+            redis.call('ZADD', KEYS[1], deadline, id)
+            redis.call('HINCRBY', key, 'attempts', 1)
+            redis.call('HSET', key, 'status', 'running', 'lease_id', lease_id, 'lease_expires_at', deadline, 'updated_at', now)
+            return {id, plan}
+        end
+    end
+end
+return nil
+"""
+
+# Extend a job's lease only if the caller still holds it
+_HEARTBEAT_SCRIPT = """
+local key = KEYS[1]
+if redis.call('HGET', key, 'lease_id') ~= ARGV[2] or redis.call('HGET', key, 'status') ~= 'running' then
+    return 0
+end
+redis.call('ZADD', KEYS[2], 'XX', ARGV[3], ARGV[1])
+redis.call('HSET', key, 'lease_expires_at', ARGV[3])
+return 1
+"""
+
+# Finish a job only if the caller still holds its lease
+_FINISH_SCRIPT = """
+local key = KEYS[1]
+if redis.call('HGET', key, 'lease_id') ~= ARGV[2] or redis.call('HGET', key, 'status') ~= 'running' then
+    return 0
+end
+redis.call('ZREM', KEYS[2], ARGV[1])
+local user = redis.call('HGET', key, 'user_id') or ''
+if user ~= '' then
+    redis.call('HINCRBY', KEYS[4], user, -1)
+end
+if ARGV[3] == 'retry' or ARGV[3] == 'release' then
+    if ARGV[3] == 'release' then
+        redis.call('HINCRBY', key, 'attempts', -1)
+    end
+    redis.call('HSET', key, 'status', 'queued', 'error', ARGV[4], 'lease_id', '', 'updated_at', ARGV[6])
+    redis.call('ZADD', KEYS[3], ARGV[5], ARGV[1])
+elseif ARGV[3] == 'succeeded' then
+    redis.call('HSET', key, 'status', 'succeeded', 'result', ARGV[4], 'error', '', 'lease_id', '', 'updated_at', ARGV[6])
+    redis.call('EXPIRE', key, ARGV[7])
+    redis.call('LPUSH', KEYS[5], ARGV[1])
+    redis.call('LTRIM', KEYS[5], 0, 999)
+else
+    redis.call('HSET', key, 'status', 'failed', 'error', ARGV[4], 'lease_id', '', 'updated_at', ARGV[6])
+    redis.call('EXPIRE', key, ARGV[7])
+end
+return 1
+"""
+
+class RedisJobQueue:
+    """Job queue backed by the configured Redis instance"""
+
+    def __init__(self, redis_url: str = REDIS_URL, visibility_timeout: int = JOB_VISIBILITY_TIMEOUT,
+                 prefix: str = "adforgeai:jobs"):
+        import redis
+
+        self.redis = redis.Redis.from_url(redis_url, decode_responses=True)
+        self.visibility_timeout = visibility_timeout
+        self.ready_prefix = f"{prefix}:ready:"
+        self.delayed_key = f"{prefix}:delayed"
+        self.leased_key = f"{prefix}:leased"
+        self.running_key = f"{prefix}:running"
+        self.completed_key = f"{prefix}:completed"
+        self.job_prefix = f"{prefix}:job:"
+        self.dedupe_prefix = f"{prefix}:dedupe:"
+        self.scheduler = PlanScheduler()
+        # How far into a lane to look past users who are at their concurrency cap
+        self.scan_depth = 50
+        self._enqueue = self.redis.register_script(_ENQUEUE_SCRIPT)
+        self._recover = self.redis.register_script(_RECOVER_SCRIPT)
+        self._dequeue = self.redis.register_script(_DEQUEUE_SCRIPT)
+        self._heartbeat = self.redis.register_script(_HEARTBEAT_SCRIPT)
+        self._finish = self.redis.register_script(_FINISH_SCRIPT)
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.job_prefix}{job_id}"
+
+    def _hash_to_job(self, data: Dict) -> Dict:
+        return {
+            "id": data["id"],
+            "type": data["type"],
+            "user_id": data.get("user_id") or None,
+            "plan": data.get("plan", "trial"),
+            "payload": json.loads(data["payload"]),
+            "status": data["status"],
+            "attempts": int(data.get("attempts", 0)),
+            "max_attempts": int(data["max_attempts"]),
+            "result": json.loads(data["result"]) if data.get("result") else None,
+            "error": data.get("error") or None,
+            "lease_id": data.get("lease_id") or None,
+            "lease_expires_at": float(data["lease_expires_at"]) if data.get("lease_expires_at") else None,
+            "created_at": float(data["created_at"]),
+            "updated_at": float(data["updated_at"])
+        }
+
+    def enqueue(self, job_type: str, payload: Dict, user_id: str = None, plan: str = "trial",
+                max_attempts: int = JOB_MAX_ATTEMPTS, dedupe_key: str = None) -> str:
+        """Add a job to its plan's lane and return its id
+
+        If dedupe_key matches a job that is still queued or running, that job's id is returned instead.
+        """
+        job_id = uuid.uuid4().hex
+        plan = normalize_plan(plan)
+        now = time.time()
+
+        fields = {
+            "id": job_id,
+            "type": job_type,
+            "user_id": user_id or "",
+            "plan": plan,
+            "payload": json.dumps(payload),
+            "status": QUEUED,
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "created_at": now,
+            "updated_at": now
+        }
+        keys = [self._job_key(job_id), f"{self.ready_prefix}{plan}"]
+        if dedupe_key:
+            keys.append(f"{self.dedupe_prefix}{dedupe_key}")
+        # The dedupe check and the insert run as one script, so concurrent duplicates cannot both enqueue
+        existing_id = self._enqueue(
+            keys=keys,
+            args=[job_id, self.job_prefix, JOB_RESULT_TTL] + [item for field in fields.items() for item in field]
+        )
+        if existing_id != job_id:
+            logger.info(f"Coalesced {job_type} request into job {existing_id}")
+            return existing_id
+        logger.info(f"Enqueued {job_type} job {job_id} ({plan})")
+        return job_id
+
+    def _waiting_since(self) -> Dict[str, float]:
+        """Ready time of the oldest job in each non-empty lane"""
+        plans = list(self.scheduler.weights)
+        pipe = self.redis.pipeline()
+        for plan in plans:
+            pipe.lindex(f"{self.ready_prefix}{plan}", -1)
+        heads = pipe.execute()
+
+        pipe = self.redis.pipeline()
+        for job_id in heads:
+            if job_id:
+                pipe.hget(self._job_key(job_id), "updated_at")
+        stamps = iter(pipe.execute())
+        return {plan: float(next(stamps) or 0) for plan, job_id in zip(plans, heads) if job_id}
+
+    def dequeue(self) -> Optional[Dict]:
+        """Lease the next job chosen by the plan scheduler, or return None if nothing is ready"""
+        now = time.time()
+        self._recover(
+            keys=[self.delayed_key, self.leased_key, self.running_key],
+            args=[now, self.job_prefix, self.ready_prefix, JOB_RESULT_TTL]
+        )
+
+        lanes = self.scheduler.order_lanes(self._waiting_since(), now)
+        if not lanes:
+            return None
+
+        caps = self.scheduler.lane_caps()
+        lane_args = []
+        for plan in lanes:
+            lane_args.extend([plan, caps[plan]])
+
+        lease_id = uuid.uuid4().hex
+        leased = self._dequeue(
+            keys=[self.leased_key, self.running_key],
+            args=[now, now + self.visibility_timeout, lease_id, self.job_prefix, self.ready_prefix,
+                  self.scan_depth] + lane_args
+        )
+        if not leased:
+            return None
+
+        job_id, plan = leased
+        self.scheduler.charge(plan)
+        return self.get(job_id)
+
+    def heartbeat(self, job_id: str, lease_id: str) -> bool:
+        """Extend a running job's lease; returns False if the lease was lost"""
+        return bool(self._heartbeat(
+            keys=[self._job_key(job_id), self.leased_key],
+            args=[job_id, lease_id, time.time() + self.visibility_timeout]
+        ))
+
+    def _finish_job(self, job_id: str, lease_id: str, outcome: str, value: str, retry_at: float = 0) -> bool:
+        return bool(self._finish(
+            keys=[self._job_key(job_id), self.leased_key, self.delayed_key, self.running_key, self.completed_key],
+            args=[job_id, lease_id, outcome, value, retry_at, time.time(), JOB_RESULT_TTL]
+        ))
+
+    def complete(self, job_id: str, lease_id: str, result: Dict) -> bool:
+        """Store a job's result and mark it succeeded"""
+        return self._finish_job(job_id, lease_id, SUCCEEDED, json.dumps(result))
+
+    def release(self, job_id: str, lease_id: str, delay: float) -> bool:
+        """Put a job back in its lane after `delay` seconds without using up an attempt"""
+        return self._finish_job(job_id, lease_id, "release", "", time.time() + delay)
+
+    def fail(self, job_id: str, lease_id: str, error: str, retry: bool = True) -> bool:
+        """Record a failed attempt, scheduling a retry while attempts remain"""
+        job = self.get(job_id)
+        if job is None:
+            return False
+        if retry and job["attempts"] < job["max_attempts"]:
+            retry_at = time.time() + _retry_delay(job["attempts"])
+            return self._finish_job(job_id, lease_id, "retry", error, retry_at)
+        return self._finish_job(job_id, lease_id, FAILED, error)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Get a job by id"""
+        data = self.redis.hgetall(self._job_key(job_id))
+        return self._hash_to_job(data) if data else None
+
+    def recent_results(self, job_type: str, limit: int = 200) -> List[Dict]:
+        """Results of the most recently succeeded jobs of a type"""
+        job_ids = self.redis.lrange(self.completed_key, 0, -1)
+        pipe = self.redis.pipeline()
+        for job_id in job_ids:
+            pipe.hmget(self._job_key(job_id), "type", "result")
+        results = []
+        for found_type, result in pipe.execute():
+            if found_type == job_type and result:
+                results.append(json.loads(result))
+                if len(results) == limit:
+                    break
+        return results
+
+# Global queue instance
+job_queue = None
+
+def get_job_queue():
+    """Get the configured job queue (Redis in production, SQLite locally)"""
+    global job_queue
+    if job_queue is None:
+        if JOB_QUEUE_BACKEND == "redis":
+            job_queue = RedisJobQueue()
+        else:
+            job_queue = SQLiteJobQueue()
+        logger.info(f"Using {JOB_QUEUE_BACKEND} job queue")
+    return job_queue
@@ -0,0 +1,91 @@
+# backend/tasks/scheduling.py
+import time
+import logging
+from typing import Dict, List
+
+from backend.config import (
+    PLAN_SCHEDULING_WEIGHTS, JOB_STARVATION_SECONDS, JOB_STARVATION_SHARE, PRO_PLAN_LIMITS, BASIC_PLAN_LIMITS, TRIAL_LIMITS
+)
+
+logger = logging.getLogger(__name__)
+
+PLAN_LIMITS = {
+    "pro": PRO_PLAN_LIMITS,
+    "basic": BASIC_PLAN_LIMITS,
+    "trial": TRIAL_LIMITS
+}
+
+def normalize_plan(plan: str) -> str:
+    """Map unknown or missing plans onto the trial lane"""
+    return plan if plan in PLAN_SCHEDULING_WEIGHTS else "trial"
+
+def user_concurrency_limit(plan: str) -> int:
+    """Maximum number of jobs one user on this plan may have running at once"""
+    return PLAN_LIMITS[normalize_plan(plan)].get("concurrent_jobs", 1)
+
+class PlanScheduler:
+    """Stride scheduler that shares workers between plan lanes by weight
+
+    Each lane carries a pass value that advances by 1/weight every time it is
+    served, and the non-empty lane that would finish its next job earliest
+    (pass + 1/weight) goes next, so heavier lanes win ties. A lane
+    whose oldest job has waited longer than the starvation limit may jump
+    ahead of its pass, but only for one in every starvation_share jobs, so
+    an aged backlog cannot take over the workers.
+    """
+
+    def __init__(self, weights: Dict[str, int] = PLAN_SCHEDULING_WEIGHTS,
+                 starvation_seconds: float = JOB_STARVATION_SECONDS,
+                 starvation_share: int = JOB_STARVATION_SHARE):
+        self.weights = weights
+        self.starvation_seconds = starvation_seconds
+        self.starvation_share = max(1, starvation_share)
+        self.passes = {plan: 0.0 for plan in weights}
+        self._active = set()
+        # Jobs served in fair order since a starved lane last jumped ahead
+        self._served_since_jump = self.starvation_share
+        self._jumped = None
+
+    def order_lanes(self, waiting_since: Dict[str, float], now: float = None) -> List[str]:
+        """Order the non-empty lanes by who should be served next
+
+        waiting_since maps each non-empty lane to the time its oldest job became ready.
+        """
+        now = now or time.time()
+        active = [plan for plan in waiting_since if plan in self.weights]
+
+        # A lane that was idle must not bank credit and then monopolise the workers
+        floor = min((self.passes[plan] for plan in active if plan in self._active), default=None)
+        if floor is not None:
+            for plan in active:
+                if plan not in self._active:
+                    self.passes[plan] = max(self.passes[plan], floor)
+        self._active = set(active)
+
+        fair = sorted(
+            active,
+            key=lambda plan: (self.passes[plan] + 1.0 / self.weights[plan], -self.weights[plan])
+        )
+        starving = sorted(
+            (plan for plan in active if now - waiting_since[plan] >= self.starvation_seconds),
+            key=lambda plan: waiting_since[plan]
+        )
+        self._jumped = None
+        if starving and starving[0] != fair[0] and self._served_since_jump >= self.starvation_share - 1:
+            self._jumped = starving[0]
+            logger.info(f"Serving starved lane {self._jumped} ahead of its turn")
+            return [self._jumped] + [plan for plan in fair if plan != self._jumped]
+        return fair
+
+    def charge(self, plan: str):
+        """Record that a job from this lane was started"""
+        self.passes[plan] += 1.0 / self.weights[plan]
+        if plan == self._jumped:
+            self._served_since_jump = 0
+        else:
+            self._served_since_jump += 1
+        self._jumped = None
+
+    def lane_caps(self) -> Dict[str, int]:
+        """Per-user running-job caps for every lane"""
+        return {plan: user_concurrency_limit(plan) for plan in self.weights}
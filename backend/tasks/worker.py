@@ -0,0 +1,164 @@
+# backend/tasks/worker.py
+import asyncio
+import os
+import signal
+import socket
+import threading
+import time
+import logging
+from typing import Callable, Dict, Optional
+
+from backend.config import JOB_POLL_INTERVAL, JOB_VISIBILITY_TIMEOUT, LOG_LEVEL
+from backend.tasks.job_queue import get_job_queue
+from backend.utils.resource_governor import JobRejected
+from backend.utils.scratch import scratch_manager
+from backend.utils.http_clients import http_clients
+
+logger = logging.getLogger(__name__)
+
+class JobWorker:
+    """Pulls jobs from the queue and runs them outside the API process"""
+
+    def __init__(self, queue=None):
+        self.queue = queue or get_job_queue()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = threading.Event()
+        self._editor = None
+        self._generator = None
+        # Handlers take the job's payload and the id of the user who queued it
+        self.handlers: Dict[str, Callable[[Dict, Optional[str]], Dict]] = {
+            "process_video": self.run_process_video,
+            "generate_video": self.run_generate_video,
+            "render_edit": self.run_render_edit,
+            "render_generated_video": self.run_render_generated_video
+        }
+
+    @property
+    def editor(self):
+        if self._editor is None:
+            from backend.ai_engine.smart_editor import SmartEditor
+            self._editor = SmartEditor()
+        return self._editor
+
+    @property
+    def generator(self):
+        if self._generator is None:
+            from backend.ai_engine.video_generator import VideoGenerator
+            self._generator = VideoGenerator()
+        return self._generator
+
+    def run_process_video(self, payload: Dict, user_id: Optional[str] = None) -> Dict:
+        result = self.editor.process_video(payload["video_path"], payload.get("platforms"))
+        if user_id:
+            from backend.ai_engine.edl import edl_store
+            # Only the user who asked for these edits may open or render them through the API
+            for edl_id in result.get("edits", {}).values():
+                if edl_id:
+                    edl_store.grant(edl_id, user_id)
+        return result
+
+    def run_render_edit(self, payload: Dict, user_id: Optional[str] = None) -> Dict:
+        edl_id = payload["edl_id"]
+        quality = payload.get("quality", "full")
+        return {"edl_id": edl_id, "quality": quality,
+                "output_path": self.editor.render_edl(edl_id, quality=quality)}
+
+    @staticmethod
+    def _run_async(coro):
+        """Run a coroutine on a fresh event loop and close the HTTP clients opened on it"""
+        async def run():
+            try:
+                return await coro
+            finally:
+                await http_clients.aclose()
+        return asyncio.run(run())
+
+    def run_generate_video(self, payload: Dict, user_id: Optional[str] = None) -> Dict:
+        return self._run_async(self.generator.generate_complete_video(
+            payload["topic"],
+            duration=payload.get("duration", 60),
+            style=payload.get("style", "engaging"),
+            voice_id=payload.get("voice_id", "21m00Tcm4TlvDq8ikWAM"),
+            quality="preview" if payload.get("preview") else "full"
+        ))
+
+    def run_render_generated_video(self, payload: Dict, user_id: Optional[str] = None) -> Dict:
+        # Cached voiceovers can be evicted after a long gap between preview and confirmation
+        if not os.path.exists(payload["voiceover_path"]):
+            raise JobRejected("Voiceover is no longer available; generate the video again")
+        video_path = self._run_async(self.generator.create_video_from_script(
+            payload["script"], payload["voiceover_path"], payload.get("stock_footage"), quality="full"
+        ))
+        return {"video_path": video_path, "quality": "full"}
+
+    def _keep_lease_alive(self, job: Dict, done: threading.Event):
+        """Extend the lease while the job runs so long renders are not redelivered"""
+        while not done.wait(JOB_VISIBILITY_TIMEOUT / 3):
+            if not self.queue.heartbeat(job["id"], job["lease_id"]):
+                logger.warning(f"Lost lease on job {job['id']}")
+                return
+
+    def run_job(self, job: Dict):
+        """Run a single leased job and report its outcome"""
+        handler = self.handlers.get(job["type"])
+        if handler is None:
+            self.queue.fail(job["id"], job["lease_id"], f"Unknown job type: {job['type']}")
+            return
+
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._keep_lease_alive, args=(job, done), daemon=True)
+        heartbeat.start()
+        started = time.monotonic()
+        try:
+            logger.info(f"[{self.worker_id}] Running {job['type']} job {job['id']} (attempt {job['attempts']})")
+            # Everything the job writes to scratch is removed when it ends, however it ends
+            with scratch_manager.job(job["id"]):
+                result = handler(job["payload"], job.get("user_id"))
+            self.queue.complete(job["id"], job["lease_id"], result)
+            logger.info(f"Job {job['id']} finished in {time.monotonic() - started:.1f}s")
+        except JobRejected as e:
+            if e.retry_after is not None:
+                logger.info(f"Deferring job {job['id']} for {e.retry_after}s: {e.reason}")
+                self.queue.release(job["id"], job["lease_id"], e.retry_after)
+            else:
+                logger.warning(f"Rejected job {job['id']}: {e.reason}")
+                self.queue.fail(job["id"], job["lease_id"], e.reason, retry=False)
+        except Exception as e:
+            logger.error(f"Job {job['id']} failed: {e}")
+            self.queue.fail(job["id"], job["lease_id"], str(e))
+        finally:
+            done.set()
+            heartbeat.join()
+
+    def run_forever(self):
+        """Poll the queue until asked to stop"""
+        logger.info(f"Worker {self.worker_id} started")
+        while not self.stopping.is_set():
+            try:
+                job = self.queue.dequeue()
+            except Exception as e:
+                logger.error(f"Failed to dequeue job: {e}")
+                job = None
+
+            if job is None:
+                self.stopping.wait(JOB_POLL_INTERVAL)
+                continue
+
+            self.run_job(job)
+        logger.info(f"Worker {self.worker_id} stopped")
+
+    def stop(self, *args):
+        """Finish the current job, then exit"""
+        self.stopping.set()
+
+def main():
+    logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    scratch_manager.sweep_stale()
+    worker = JobWorker()
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run_forever()
+    http_clients.close()
+
+if __name__ == "__main__":
+    main()
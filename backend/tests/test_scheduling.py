@@ -0,0 +1,22 @@
+# backend/tests/test_scheduling.py
+import time
+from contextlib import closing
+
+from backend.tasks.job_queue import SQLiteJobQueue
+
+def test_aged_trial_backlog_does_not_delay_pro_jobs(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.db"))
+    for index in range(20):
+        queue.enqueue("process_video", {"index": index}, plan="trial")
+    with closing(queue._connect()) as conn:
+        aged = time.time() - 700
+        conn.execute("UPDATE jobs SET available_at = ?, created_at = ?", (aged, aged))
+    for index in range(5):
+        queue.enqueue("process_video", {"index": index}, plan="pro")
+
+    served = [queue.dequeue()["plan"] for _ in range(10)]
+
+    # The starved lane jumps ahead for at most one in every JOB_STARVATION_SHARE jobs
+    assert served[:7].count("pro") == 5
+    assert served[:5].count("trial") == 1
+    assert served[0] == "trial"
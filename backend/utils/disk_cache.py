@@ -0,0 +1,74 @@
+# backend/utils/disk_cache.py
+import hashlib
+import os
+import threading
+import uuid
+import logging
+from contextlib import contextmanager
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class DiskLRUCache:
+    """Files addressed by a hash of their key, evicted least recently used above max_bytes
+
+    Entries are published with an atomic rename, so concurrent writers of the same key (in this
+    or another process) never expose a partial file; readers refresh the entry's mtime, which is
+    the recency eviction uses.
+    """
+
+    def __init__(self, root: str, max_bytes: int, suffix: str = ""):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._evict_lock = threading.Lock()
+
+    def path_for(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode()).hexdigest()[:40]
+        return os.path.join(self.root, f"{digest}{self.suffix}")
+
+    def get(self, key: str) -> Optional[str]:
+        """Path of the cached file for key, or None"""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    @contextmanager
+    def writer(self, key: str):
+        """Yield a temporary path to write the entry to; it is published when the block succeeds"""
+        os.makedirs(self.root, exist_ok=True)
+        path = self.path_for(key)
+        temp_path = os.path.join(self.root, f".{uuid.uuid4().hex}{self.suffix}")
+        try:
+            yield temp_path
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits max_bytes"""
+        with self._evict_lock:
+            try:
+                entries = []
+                for entry in os.scandir(self.root):
+                    # Dot files are writes in progress
+                    if entry.is_file() and not entry.name.startswith("."):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except FileNotFoundError:
+                return
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    continue
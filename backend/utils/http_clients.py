@@ -0,0 +1,81 @@
+# backend/utils/http_clients.py
+import asyncio
+import threading
+import weakref
+import logging
+from typing import Dict
+
+import httpx
+
+from backend.config import HTTP_CLIENT_PROFILES, HTTP_KEEPALIVE_EXPIRY
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (httpx only negotiates HTTP/2 when the h2 package is installed)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+def _client_options(name: str) -> Dict:
+    profile = HTTP_CLIENT_PROFILES.get(name, HTTP_CLIENT_PROFILES["default"])
+    return {
+        "http2": profile["http2"] and HTTP2_AVAILABLE,
+        "limits": httpx.Limits(
+            max_connections=profile["max_connections"],
+            max_keepalive_connections=profile["max_keepalive_connections"],
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        ),
+        "timeout": httpx.Timeout(profile["timeout"], connect=profile["connect_timeout"]),
+        "follow_redirects": True
+    }
+
+class HTTPClientRegistry:
+    """Long-lived, pooled httpx clients, one per upstream service
+
+    Async clients are bound to the event loop that created them, so each loop gets its own set
+    (the API has one loop; workers start a loop per job and close its clients when it ends).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = \
+            weakref.WeakKeyDictionary()
+        self._sync_clients: Dict[str, httpx.Client] = {}
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """Async client for a service, created on first use in the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+            client = clients.get(name)
+            if client is None or client.is_closed:
+                client = clients[name] = httpx.AsyncClient(**_client_options(name))
+            return client
+
+    def get_sync(self, name: str) -> httpx.Client:
+        """Blocking client for a service, shared across threads"""
+        with self._lock:
+            client = self._sync_clients.get(name)
+            if client is None or client.is_closed:
+                client = self._sync_clients[name] = httpx.Client(**_client_options(name))
+            return client
+
+    async def aclose(self):
+        """Close the async clients of the running event loop"""
+        with self._lock:
+            clients = self._async_clients.pop(asyncio.get_running_loop(), {})
+        for name, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close HTTP client {name}: {e}")
+
+    def close(self):
+        """Close the blocking clients"""
+        with self._lock:
+            clients, self._sync_clients = self._sync_clients, {}
+        for client in clients.values():
+            client.close()
+
+http_clients = HTTPClientRegistry()
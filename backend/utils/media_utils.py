@@ -0,0 +1,53 @@
+# backend/utils/media_utils.py
+import cv2
+import hashlib
+import os
+import logging
+from typing import Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Digests keyed by (path, size, mtime) so unchanged files are only read once
+_hash_cache: Dict[Tuple[str, int, int], str] = {}
+_HASH_CACHE_SIZE = 1024
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Return the SHA-256 hex digest of a file's contents"""
+    stat = os.stat(path)
+    cache_key = (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+    cached = _hash_cache.get(cache_key)
+    if cached:
+        return cached
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+
+    if len(_hash_cache) >= _HASH_CACHE_SIZE:
+        _hash_cache.clear()
+    _hash_cache[cache_key] = digest.hexdigest()
+    return _hash_cache[cache_key]
+
+def get_ffmpeg_binary() -> str:
+    """Get the ffmpeg binary moviepy is configured to use"""
+    from moviepy.config import get_setting
+    return get_setting("FFMPEG_BINARY")
+
+def probe_video(video_path: str) -> Dict:
+    """Read duration, resolution and fps from the container without decoding frames"""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            raise ValueError(f"Unable to open video: {video_path}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        return {
+            "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0),
+            "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0),
+            "fps": fps,
+            "frame_count": frame_count,
+            "duration": frame_count / fps if fps > 0 else 0.0
+        }
+    finally:
+        cap.release()
@@ -0,0 +1,141 @@
+# backend/utils/metrics.py
+import os
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, List
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+def _cpu_seconds() -> float:
+    # Includes reaped children, which is where ffmpeg encode time ends up
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+class _ResourceSampler(threading.Thread):
+    """Polls RSS and I/O counters of this process and its children while a stage runs"""
+
+    def __init__(self, interval: float = 0.1):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.process = psutil.Process()
+        self.stopped = threading.Event()
+        self.peak_rss = 0
+
+    def sample(self):
+        rss = self.process.memory_info().rss
+        for child in self.process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        self.peak_rss = max(self.peak_rss, rss)
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.sample()
+            self.stopped.wait(self.interval)
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+        self.sample()
+
+def _io_bytes(process: psutil.Process) -> tuple:
+    # On Linux these counters also include children once they have been reaped
+    try:
+        io = process.io_counters()
+        return io.read_bytes, io.write_bytes
+    except (AttributeError, psutil.AccessDenied):
+        return 0, 0
+
+class StageMetrics:
+    """Records wall time, CPU time, peak RSS and bytes read/written for each pipeline stage
+
+    Figures are process-wide, so stages that overlap in time share their CPU and I/O.
+    """
+
+    def __init__(self):
+        self.stages: List[Dict] = []
+        self.process = psutil.Process()
+
+    @contextmanager
+    def stage(self, name: str):
+        sampler = _ResourceSampler()
+        read_start, write_start = _io_bytes(self.process)
+        cpu_start = _cpu_seconds()
+        wall_start = time.perf_counter()
+        sampler.start()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            sampler.stop()
+            read_end, write_end = _io_bytes(self.process)
+            record = {
+                "stage": name,
+                "wall_seconds": round(time.perf_counter() - wall_start, 3),
+                "cpu_seconds": round(_cpu_seconds() - cpu_start, 3),
+                "peak_rss_mb": round(sampler.peak_rss / MB, 1),
+                "bytes_read": read_end - read_start,
+                "bytes_written": write_end - write_start
+            }
+            if error:
+                record["error"] = error
+            self.stages.append(record)
+            logger.info(f"Stage metrics: {record}")
+
+    def skipped(self, name: str, reason: str):
+        """Record a stage that did not run, e.g. because it was restored from a checkpoint"""
+        self.stages.append({"stage": name, "skipped": reason})
+
+    def summary(self) -> Dict:
+        ran = [s for s in self.stages if "skipped" not in s]
+        return {
+            "stages": self.stages,
+            "total_wall_seconds": round(sum(s["wall_seconds"] for s in ran), 3),
+            "total_cpu_seconds": round(sum(s["cpu_seconds"] for s in ran), 3),
+            "peak_rss_mb": max((s["peak_rss_mb"] for s in ran), default=0)
+        }
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def aggregate_stage_metrics(summaries: List[Dict]) -> Dict:
+    """Combine per-job metric summaries into per-stage statistics"""
+    by_stage: Dict[str, List[Dict]] = {}
+    for summary in summaries:
+        for record in summary.get("stages", []):
+            if "skipped" in record:
+                continue
+            # Platform edits are reported together (edit_tiktok, edit_youtube_shorts, ...)
+            name = "edit" if record["stage"].startswith("edit_") else record["stage"]
+            by_stage.setdefault(name, []).append(record)
+
+    stats = {}
+    for name, records in by_stage.items():
+        wall = [r["wall_seconds"] for r in records]
+        cpu = [r["cpu_seconds"] for r in records]
+        rss = [r["peak_rss_mb"] for r in records]
+        stats[name] = {
+            "count": len(records),
+            "wall_seconds_p50": _percentile(wall, 50),
+            "wall_seconds_p95": _percentile(wall, 95),
+            "cpu_seconds_avg": round(sum(cpu) / len(cpu), 3),
+            "peak_rss_mb_p95": _percentile(rss, 95),
+            "peak_rss_mb_max": max(rss),
+            "bytes_read_avg": sum(r["bytes_read"] for r in records) // len(records),
+            "bytes_written_avg": sum(r["bytes_written"] for r in records) // len(records),
+            "errors": sum(1 for r in records if "error" in r)
+        }
+    return stats
@@ -0,0 +1,66 @@
+# backend/utils/process_pool.py
+import asyncio
+import multiprocessing
+import threading
+import weakref
+import logging
+from typing import Callable, Optional
+
+from backend.config import MEDIA_PROCESS_WORKERS
+
+logger = logging.getLogger(__name__)
+
+class MediaProcessPool:
+    """Runs blocking media work (moviepy decoding and encoding) in spawned processes, off the event loop
+
+    Each call gets its own worker process, so a call that times out or is cancelled is stopped by
+    terminating that process without disturbing the others. At most max_processes calls run at
+    once per event loop; node-wide CPU and memory are still limited by the resource governor.
+    """
+
+    def __init__(self, max_processes: int = MEDIA_PROCESS_WORKERS):
+        self.max_processes = max(1, max_processes)
+        self._lock = threading.Lock()
+        self._slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+
+    def _loop_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            slots = self._slots.get(loop)
+            if slots is None:
+                slots = self._slots[loop] = asyncio.Semaphore(self.max_processes)
+            return slots
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None):
+        """Call fn(*args) in a worker process and return its result
+
+        fn must be a top-level function, and its arguments and result picklable. Raises
+        asyncio.TimeoutError after timeout seconds; either way the worker process is stopped.
+        """
+        async with self._loop_slots():
+            loop = asyncio.get_running_loop()
+            result = loop.create_future()
+
+            def settle(setter, value):
+                if not result.done():
+                    setter(value)
+
+            # spawn keeps the worker free of the parent's threads, event loop and open readers
+            pool = multiprocessing.get_context("spawn").Pool(processes=1)
+            try:
+                pool.apply_async(
+                    fn, args,
+                    callback=lambda value: loop.call_soon_threadsafe(settle, result.set_result, value),
+                    error_callback=lambda error: loop.call_soon_threadsafe(settle, result.set_exception, error)
+                )
+                pool.close()
+                return await asyncio.wait_for(result, timeout)
+            except asyncio.TimeoutError:
+                logger.error(f"{fn.__name__} timed out after {timeout}s; stopping its process")
+                raise
+            finally:
+                # Also stops a call that is still running because it timed out or was cancelled
+                await asyncio.to_thread(pool.terminate)
+
+media_pool = MediaProcessPool()
@@ -0,0 +1,149 @@
+# backend/utils/resource_governor.py
+import fcntl
+import math
+import os
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from backend.config import (
+    MAX_VIDEO_DURATION, WHISPER_MODEL, GOVERNOR_LOCK_DIR, MAX_CONCURRENT_CPU_STAGES,
+    NODE_MEMORY_BUDGET_MB, MEMORY_SLOT_MB, GOVERNOR_WAIT_TIMEOUT, GOVERNOR_RETRY_AFTER
+)
+from backend.utils.media_utils import probe_video
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# Approximate resident memory of each Whisper model while transcribing
+WHISPER_MEMORY_MB = {
+    "tiny": 1000,
+    "base": 1000,
+    "small": 2000,
+    "medium": 5000,
+    "large": 10000
+}
+
+class JobRejected(Exception):
+    """Raised when a job cannot run on this node; retry_after is None for permanent rejections"""
+
+    def __init__(self, reason: str, retry_after: Optional[int] = None):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+class ResourceGovernor:
+    """Limits concurrent CPU-heavy and memory-heavy media stages across all processes on a node
+
+    Capacity is modelled as lock files: one per CPU slot and one per MEMORY_SLOT_MB of the
+    node's memory budget. flock() releases them automatically if a worker dies.
+    """
+
+    def __init__(self, lock_dir: str = GOVERNOR_LOCK_DIR, cpu_slots: int = MAX_CONCURRENT_CPU_STAGES,
+                 memory_budget_mb: int = NODE_MEMORY_BUDGET_MB):
+        self.lock_dir = lock_dir
+        self.cpu_slots = max(1, cpu_slots)
+        self.memory_budget_mb = memory_budget_mb
+        self.memory_slots = max(1, memory_budget_mb // MEMORY_SLOT_MB)
+
+    def render_memory_mb(self, width: int, height: int, output_size=(1080, 1920)) -> float:
+        """Rough peak memory of a moviepy render: decoder, compositor and encoder frame buffers"""
+        frame_bytes = width * height * 3 + output_size[0] * output_size[1] * 3
+        return 300 + frame_bytes * 20 / MB
+
+    def transcribe_memory_mb(self, duration: float) -> float:
+        """Whisper model plus the 16 kHz float32 audio it holds in memory"""
+        return WHISPER_MEMORY_MB.get(WHISPER_MODEL, 2000) + duration * 16000 * 4 / MB
+
+    def estimate_cost(self, video_path: str) -> Dict:
+        """Estimate a job's cost from container metadata (no frames are decoded)"""
+        info = probe_video(video_path)
+        pixels_ratio = (info["width"] * info["height"]) / (1920 * 1080)
+        return {
+            **info,
+            "render_memory_mb": round(self.render_memory_mb(info["width"], info["height"])),
+            "transcribe_memory_mb": round(self.transcribe_memory_mb(info["duration"])),
+            # ~2 CPU-seconds per second of 1080p source for decode, analysis and encode
+            "cpu_seconds": round(info["duration"] * max(pixels_ratio, 0.1) * 2)
+        }
+
+    def admit(self, video_path: str) -> Dict:
+        """Reject jobs this node can never run, before any decoding happens"""
+        try:
+            cost = self.estimate_cost(video_path)
+        except ValueError as e:
+            raise JobRejected(str(e))
+
+        if cost["duration"] > MAX_VIDEO_DURATION:
+            raise JobRejected(f"Video is {cost['duration']:.0f}s long; the maximum is {MAX_VIDEO_DURATION}s")
+
+        peak_mb = max(cost["render_memory_mb"], cost["transcribe_memory_mb"])
+        if peak_mb > self.memory_budget_mb:
+            raise JobRejected(f"Estimated peak memory {peak_mb}MB exceeds the node budget of {self.memory_budget_mb}MB")
+
+        logger.info(f"Admitted {video_path}: {cost}")
+        return cost
+
+    def _slot_path(self, kind: str, index: int) -> str:
+        return os.path.join(self.lock_dir, f"{kind}-{index}.lock")
+
+    def _try_acquire(self, kind: str, total: int, units: int) -> Optional[List[int]]:
+        """Lock `units` free slots of a kind without blocking, or none at all"""
+        fds = []
+        for index in range(total):
+            if len(fds) == units:
+                break
+            fd = os.open(self._slot_path(kind, index), os.O_CREAT | os.O_RDWR, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                fds.append(fd)
+            except BlockingIOError:
+                os.close(fd)
+
+        if len(fds) < units:
+            self._release(fds)
+            return None
+        return fds
+
+    @staticmethod
+    def _release(fds: List[int]):
+        for fd in fds:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    @contextmanager
+    def reserve(self, cpu: int = 0, memory_mb: float = 0, timeout: float = GOVERNOR_WAIT_TIMEOUT):
+        """Hold CPU slots and memory budget for the duration of a heavy stage
+
+        Waits up to `timeout` seconds for capacity, then raises JobRejected with a retry-after.
+        """
+        if not cpu and not memory_mb:
+            yield
+            return
+
+        os.makedirs(self.lock_dir, exist_ok=True)
+        cpu_units = min(cpu, self.cpu_slots)
+        memory_units = min(int(math.ceil(memory_mb / MEMORY_SLOT_MB)), self.memory_slots)
+        deadline = time.monotonic() + timeout
+
+        while True:
+            cpu_fds = self._try_acquire("cpu", self.cpu_slots, cpu_units) if cpu_units else []
+            if cpu_fds is not None:
+                memory_fds = self._try_acquire("memory", self.memory_slots, memory_units) if memory_units else []
+                if memory_fds is not None:
+                    break
+                self._release(cpu_fds)
+
+            if time.monotonic() >= deadline:
+                raise JobRejected("Node is at capacity for heavy media stages", retry_after=GOVERNOR_RETRY_AFTER)
+            time.sleep(0.5)
+
+        try:
+            yield
+        finally:
+            self._release(cpu_fds + memory_fds)
+
+# Global governor instance
+governor = ResourceGovernor()
@@ -0,0 +1,175 @@
+# backend/utils/scratch.py
+import contextvars
+import os
+import shutil
+import socket
+import time
+import uuid
+import logging
+from contextlib import contextmanager
+from typing import Optional
+
+from backend.config import (
+    SCRATCH_DIR, SCRATCH_TMPFS_DIR, SCRATCH_TMPFS_MAX_FILE, SCRATCH_QUOTA_BYTES, SCRATCH_WAIT_TIMEOUT
+)
+
+logger = logging.getLogger(__name__)
+
+OWNER_FILE = ".owner"
+RESERVED_FILE = ".reserved"
+
+class ScratchQuotaExceeded(Exception):
+    """Raised when scratch space does not free up within the wait timeout"""
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+    return total
+
+def _read_int(path: str) -> int:
+    try:
+        with open(path) as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+class JobScratch:
+    """Temporary directories owned by one job"""
+
+    def __init__(self, manager: "ScratchManager", job_id: str):
+        self.manager = manager
+        self.job_id = job_id
+        self.directory = os.path.join(manager.root, job_id)
+        self.tmpfs_directory = os.path.join(manager.tmpfs_root, job_id) if manager.tmpfs_root else None
+
+    def path(self, filename: str, expected_size: int = 0) -> str:
+        """Path for a new temp file; small files go to tmpfs when it is available
+
+        Disk-backed files reserve `expected_size` bytes against the node quota first.
+        """
+        name, ext = os.path.splitext(filename)
+        unique_name = f"{name}_{uuid.uuid4().hex[:8]}{ext}"
+
+        if self.tmpfs_directory and 0 < expected_size <= SCRATCH_TMPFS_MAX_FILE:
+            try:
+                os.makedirs(self.tmpfs_directory, exist_ok=True)
+                if shutil.disk_usage(self.tmpfs_directory).free > expected_size * 2:
+                    return os.path.join(self.tmpfs_directory, unique_name)
+            except OSError as e:
+                logger.warning(f"tmpfs scratch unavailable, using disk: {e}")
+
+        if expected_size:
+            self.reserve(expected_size)
+        return os.path.join(self.directory, unique_name)
+
+    def reserve(self, nbytes: int):
+        """Block until the node quota has room for `nbytes` more, then claim it"""
+        deadline = time.monotonic() + SCRATCH_WAIT_TIMEOUT
+        while True:
+            usage = self.manager.usage()
+            if usage + nbytes <= self.manager.quota:
+                break
+            if time.monotonic() >= deadline:
+                raise ScratchQuotaExceeded(
+                    f"Scratch quota full ({usage} of {self.manager.quota} bytes used, {nbytes} requested)"
+                )
+            logger.info(f"Waiting for scratch space: {usage} of {self.manager.quota} bytes used")
+            time.sleep(1)
+
+        reserved_path = os.path.join(self.directory, RESERVED_FILE)
+        with open(reserved_path, "w") as f:
+            f.write(str(_read_int(reserved_path) + nbytes))
+
+    def cleanup(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        if self.tmpfs_directory:
+            shutil.rmtree(self.tmpfs_directory, ignore_errors=True)
+
+_current_scratch: contextvars.ContextVar = contextvars.ContextVar("current_scratch", default=None)
+
+class ScratchManager:
+    """Allocates per-job scratch directories and removes them when the job ends"""
+
+    def __init__(self, root: str = SCRATCH_DIR, tmpfs_root: str = SCRATCH_TMPFS_DIR, quota: int = SCRATCH_QUOTA_BYTES):
+        self.root = root
+        self.quota = quota
+        # Only use tmpfs if its mount point exists on this node
+        self.tmpfs_root = tmpfs_root if tmpfs_root and os.path.isdir(os.path.dirname(tmpfs_root.rstrip("/"))) else None
+        self.hostname = socket.gethostname()
+
+    def usage(self) -> int:
+        """Bytes used by all jobs on this node, counting unused reservations"""
+        if not os.path.isdir(self.root):
+            return 0
+        total = 0
+        for entry in os.scandir(self.root):
+            if entry.is_dir():
+                reserved = _read_int(os.path.join(entry.path, RESERVED_FILE))
+                total += max(_dir_size(entry.path), reserved)
+        return total
+
+    @contextmanager
+    def job(self, job_id: str = None):
+        """Scratch space for a job, removed on exit even if the job fails
+
+        Nested calls without a job_id share the enclosing job's scratch.
+        """
+        current = _current_scratch.get()
+        if current is not None and job_id is None:
+            yield current
+            return
+
+        scratch = JobScratch(self, job_id or uuid.uuid4().hex)
+        os.makedirs(scratch.directory, exist_ok=True)
+        with open(os.path.join(scratch.directory, OWNER_FILE), "w") as f:
+            f.write(f"{self.hostname} {os.getpid()}")
+
+        token = _current_scratch.set(scratch)
+        try:
+            yield scratch
+        finally:
+            _current_scratch.reset(token)
+            scratch.cleanup()
+
+    def current(self) -> Optional[JobScratch]:
+        """Scratch of the job running in this context, if any"""
+        return _current_scratch.get()
+
+    def sweep_stale(self):
+        """Remove scratch left behind by processes on this node that have died"""
+        for root in filter(None, [self.root, self.tmpfs_root]):
+            if not os.path.isdir(root):
+                continue
+            for entry in os.scandir(root):
+                if not entry.is_dir():
+                    continue
+                owner_path = os.path.join(self.root, entry.name, OWNER_FILE)
+                try:
+                    with open(owner_path) as f:
+                        hostname, pid = f.read().split()
+                except (OSError, ValueError):
+                    hostname, pid = self.hostname, "0"
+                if hostname != self.hostname or self._is_alive(int(pid)):
+                    continue
+                logger.info(f"Removing stale scratch {entry.path}")
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    @staticmethod
+    def _is_alive(pid: int) -> bool:
+        if pid <= 0:
+            return False
+        try:
+            os.kill(pid, 0)
+            return True
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+
+# Global scratch manager
+scratch_manager = ScratchManager()
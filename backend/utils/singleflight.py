@@ -0,0 +1,11 @@
+# backend/utils/singleflight.py
+import hashlib
+import json
+from typing import Dict
+
+from backend.utils.media_utils import hash_file
+
+def coalesce_key(video_path: str, operation: str, params: Dict = None) -> str:
+    """Build a key identifying one computation on one video's contents"""
+    params_digest = hashlib.sha256(json.dumps(params or {}, sort_keys=True, default=str).encode()).hexdigest()
+    return f"{operation}:{hash_file(video_path)}:{params_digest[:16]}"
@@ -0,0 +1,105 @@
+# backend/utils/ttl_cache.py
+import json
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from backend.config import CACHE_BACKEND, REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+class LocalTTLStore:
+    """In-process stand-in for Redis GET / SET EX, used when no Redis is configured"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def ttl(self, key: str) -> int:
+        """Seconds until key expires, or -2 if it does not exist (as Redis TTL)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                return -2
+            return max(1, int(entry[0] - time.time()))
+
+    def set(self, key: str, value: str, ex: int):
+        with self._lock:
+            self._entries[key] = (time.time() + ex, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+_shared_store = None
+
+def get_shared_store():
+    """The configured Redis, or a process-local stand-in with the same interface"""
+    global _shared_store
+    if _shared_store is None:
+        if CACHE_BACKEND == "redis":
+            import redis
+            _shared_store = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+        else:
+            _shared_store = LocalTTLStore()
+        logger.info(f"Using {CACHE_BACKEND} result cache")
+    return _shared_store
+
+class TTLCache:
+    """Result cache with per-entry TTL: a small in-process LRU in front of the shared store
+
+    Values must be JSON-serializable. Store errors are logged and treated as misses, so an
+    unreachable Redis only costs the cache, never the request.
+    """
+
+    def __init__(self, namespace: str, max_entries: int = 512, store=None):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.store = store
+        self._local = LocalTTLStore(max_entries)
+
+    def _key(self, key: str) -> str:
+        return f"adforgeai:cache:{self.namespace}:{key}"
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, value)"""
+        full_key = self._key(key)
+        raw = self._local.get(full_key)
+        if raw is None:
+            try:
+                store = self.store or get_shared_store()
+                raw = store.get(full_key)
+                if raw is not None:
+                    # Keep the local copy no longer than the entry has left in the shared store
+                    ttl = store.ttl(full_key)
+                    if ttl > 0:
+                        self._local.set(full_key, raw, ttl)
+            except Exception as e:
+                logger.warning(f"Result cache read failed for {self.namespace}: {e}")
+                return False, None
+        if raw is None:
+            return False, None
+        return True, json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: int):
+        full_key = self._key(key)
+        raw = json.dumps(value)
+        self._local.set(full_key, raw, ttl)
+        try:
+            (self.store or get_shared_store()).set(full_key, raw, ex=ttl)
+        except Exception as e:
+            logger.warning(f"Result cache write failed for {self.namespace}: {e}")